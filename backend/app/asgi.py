@@ -0,0 +1,274 @@
+"""ASGI back-end api.
+
+Serves the same routes and schemas as the Flask app in the controller module,
+but handles requests on an event loop. All concurrent requests of a process
+share one DEALER connection per component.
+"""
+from contextlib import asynccontextmanager
+from json import JSONDecodeError
+from typing import Any, AsyncIterator
+
+from marshmallow import Schema, ValidationError
+from starlette.applications import Starlette
+from starlette.endpoints import HTTPEndpoint
+from starlette.middleware import Middleware
+from starlette.middleware.cors import CORSMiddleware
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response, StreamingResponse
+from starlette.routing import Route
+
+from backend.settings import METRIC_STREAM_INTERVAL
+
+from .async_service import AsyncDatabaseService, AsyncWorkloadService
+from .async_socket_manager import close_clients
+from .interface import (
+    DatabaseInterface,
+    DetailedDatabaseInterface,
+    JobInterface,
+    WorkloadInterface,
+)
+from .metric_stream import AsyncMetricStream
+from .schema import (
+    DatabaseSchema,
+    DetailedDatabaseSchema,
+    JobSchema,
+    MetricCacheSchema,
+    MetricSchema,
+    QueueLengthSchema,
+    StatusSchema,
+    WorkloadSchema,
+)
+from .socket_manager import RequestTimeoutError, ServiceUnavailableError
+
+metric_stream = AsyncMetricStream(
+    METRIC_STREAM_INTERVAL, AsyncDatabaseService.get_metrics
+)
+
+
+async def load_body(request: Request, schema: Schema) -> Any:
+    """Validate the JSON body of a request with a schema."""
+    try:
+        return schema.load(await request.json())
+    except JSONDecodeError:
+        raise ValidationError("Request body is not valid JSON.")
+
+
+class WorkloadController(HTTPEndpoint):
+    """Controller of Workloads."""
+
+    async def get(self, request: Request) -> Response:
+        """Get all Workloads."""
+        workloads = await AsyncWorkloadService.get_workloads()
+        return JSONResponse(WorkloadSchema(many=True).dump(workloads))
+
+    async def post(self, request: Request) -> Response:
+        """Create a Workload."""
+        interface: WorkloadInterface = await load_body(request, WorkloadSchema())
+        return Response(status_code=await AsyncWorkloadService.create(interface))
+
+    async def delete(self, request: Request) -> Response:
+        """Delete all Workloads."""
+        return Response(status_code=await AsyncWorkloadService.delete())
+
+
+class NamedWorkloadController(HTTPEndpoint):
+    """Controller of a single Workload."""
+
+    async def get(self, request: Request) -> Response:
+        """Get a Workload."""
+        workload_name = request.path_params["workload_name"]
+        workload = await AsyncWorkloadService.get_workload(workload_name)
+        if workload is None:
+            return Response(status_code=404)
+        return JSONResponse(WorkloadSchema().dump(workload))
+
+    async def delete(self, request: Request) -> Response:
+        """Delete a Workload."""
+        workload_name = request.path_params["workload_name"]
+        status_code = await AsyncWorkloadService.delete_workload(workload_name)
+        return Response(status_code=status_code)
+
+
+class DatabasesController(HTTPEndpoint):
+    """Controller for access and register databases."""
+
+    async def get(self, request: Request) -> Response:
+        """Get all databases."""
+        databases = await AsyncDatabaseService.get_databases()
+        return JSONResponse(DetailedDatabaseSchema(many=True).dump(databases))
+
+    async def post(self, request: Request) -> Response:
+        """Register new database."""
+        database = await load_body(request, DetailedDatabaseSchema())
+        interface: DetailedDatabaseInterface = DetailedDatabaseInterface(
+            id=database.id, number_workers=database.number_workers,
+        )
+        status_code = await AsyncDatabaseService.register_database(interface)
+        return Response(status_code=status_code)
+
+    async def delete(self, request: Request) -> Response:
+        """De-register database."""
+        database = await load_body(request, DatabaseSchema())
+        interface: DatabaseInterface = DatabaseInterface(id=database.id)
+        status_code = await AsyncDatabaseService.deregister_database(interface)
+        return Response(status_code=status_code)
+
+
+class WorkerController(HTTPEndpoint):
+    """Manage start and stop of worker pool at all databases."""
+
+    async def post(self, request: Request) -> Response:
+        """Start worker pool for all databases."""
+        status_code = await AsyncDatabaseService.start_worker_pool()
+        return Response(status_code=status_code)
+
+    async def delete(self, request: Request) -> Response:
+        """Close worker pool for all databases."""
+        status_code = await AsyncDatabaseService.close_worker_pool()
+        return Response(status_code=status_code)
+
+
+class JobsController(HTTPEndpoint):
+    """Run calls of the database manager without waiting for them."""
+
+    async def post(self, request: Request) -> Response:
+        """Start a Job, answered before the call is finished."""
+        interface: JobInterface = await load_body(request, JobSchema())
+        job = await AsyncDatabaseService.start_job(interface)
+        if job is None:
+            return Response(status_code=400)
+        return JSONResponse(
+            JobSchema().dump(job),
+            status_code=202,
+            headers={"Location": f"/jobs/{job.id}"},
+        )
+
+
+class JobController(HTTPEndpoint):
+    """Controller of a single Job."""
+
+    async def get(self, request: Request) -> Response:
+        """Get the status of a Job."""
+        job = await AsyncDatabaseService.get_job(request.path_params["job_id"])
+        if job is None:
+            return Response(status_code=404)
+        return JSONResponse(JobSchema().dump(job))
+
+
+class StatusController(HTTPEndpoint):
+    """Manage status of all databases."""
+
+    async def get(self, request: Request) -> Response:
+        """Return status for all databases."""
+        status = await AsyncDatabaseService.get_status()
+        return JSONResponse(StatusSchema(many=True).dump(status))
+
+
+class QueueLengthController(HTTPEndpoint):
+    """Manage task queues of all databases."""
+
+    async def get(self, request: Request) -> Response:
+        """Return queue length for all databases."""
+        queue_length = await AsyncDatabaseService.get_queue_length()
+        return JSONResponse(QueueLengthSchema(many=True).dump(queue_length))
+
+
+class MetricStreamController(HTTPEndpoint):
+    """Push the metrics of all databases to connected clients."""
+
+    async def get(self, request: Request) -> Response:
+        """Stream the metrics as server-sent events."""
+        return StreamingResponse(
+            metric_stream.subscribe(),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache"},
+        )
+
+
+class ManagerTimeIntenseMetricController(HTTPEndpoint):
+    """Return storage information of database."""
+
+    async def get(self, request: Request) -> Response:
+        """Return storage information for all databases."""
+        metric = await AsyncDatabaseService.get_time_intense_metric()
+        return JSONResponse(MetricSchema().dump(metric))
+
+
+class ManagerMetricController(HTTPEndpoint):
+    """Return storage information of database."""
+
+    async def get(self, request: Request) -> Response:
+        """Return storage information for all databases."""
+        metric = await AsyncDatabaseService.get_metric()
+        return JSONResponse(MetricSchema().dump(metric))
+
+
+class MetricCacheController(HTTPEndpoint):
+    """Statistics of the metric cache of this process."""
+
+    async def get(self, request: Request) -> Response:
+        """Return the requests and hit ratio of every cached metric."""
+        statistics = AsyncDatabaseService.get_metric_cache_statistics()
+        return JSONResponse(MetricCacheSchema(many=True).dump(statistics))
+
+
+class FlaskMetricController(HTTPEndpoint):
+    """Return storage information of database."""
+
+    async def get(self, request: Request) -> Response:
+        """Return storage information for all databases."""
+        metric = await AsyncDatabaseService.get_flask_metric()
+        return JSONResponse(MetricSchema().dump(metric))
+
+
+async def handle_validation_error(request: Request, error: ValidationError) -> Response:
+    """Return 400 if the request body does not match the schema."""
+    return JSONResponse({"errors": error.messages}, status_code=400)
+
+
+async def handle_service_unavailable(
+    request: Request, error: ServiceUnavailableError
+) -> Response:
+    """Return 503 if a component did not answer any attempt."""
+    return JSONResponse({"message": str(error)}, status_code=503)
+
+
+async def handle_request_timeout(
+    request: Request, error: RequestTimeoutError
+) -> Response:
+    """Return 504 if a component did not answer before the deadline."""
+    return JSONResponse({"message": str(error)}, status_code=504)
+
+
+@asynccontextmanager
+async def lifespan(app: Starlette) -> AsyncIterator[None]:
+    """Close the sockets of this process on shutdown."""
+    yield
+    close_clients()
+    AsyncDatabaseService.metric_subscriber.close()
+
+
+app = Starlette(
+    routes=[
+        Route("/workload", WorkloadController),
+        Route("/workload/{workload_name}", NamedWorkloadController),
+        Route("/database", DatabasesController),
+        Route("/worker", WorkerController),
+        Route("/jobs", JobsController),
+        Route("/jobs/{job_id}", JobController),
+        Route("/status", StatusController),
+        Route("/queue_length", QueueLengthController),
+        Route("/metric_stream", MetricStreamController),
+        Route("/manager_time_intense_metric", ManagerTimeIntenseMetricController),
+        Route("/manager_metric", ManagerMetricController),
+        Route("/metric_cache", MetricCacheController),
+        Route("/flask_metric", FlaskMetricController),
+    ],
+    middleware=[Middleware(CORSMiddleware, allow_origins=["*"])],
+    exception_handlers={
+        ValidationError: handle_validation_error,
+        ServiceUnavailableError: handle_service_unavailable,
+        RequestTimeoutError: handle_request_timeout,
+    },
+    lifespan=lifespan,
+)
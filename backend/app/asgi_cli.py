@@ -0,0 +1,13 @@
+"""CLI used to start the ASGI backend API."""
+from uvicorn import run
+
+from backend.settings import BACKEND_LISTENING, BACKEND_PORT
+
+
+def main() -> None:
+    """Create and start an ASGI backend API."""
+    run("backend.app.asgi:app", host=BACKEND_LISTENING, port=int(BACKEND_PORT))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,259 @@
+"""Asynchronous services for the ASGI back-end api."""
+from asyncio import sleep
+from typing import Dict, List, Optional
+
+from backend.request import Header, Request
+from backend.response import Response
+from backend.settings import (
+    DB_MANAGER_HOST,
+    DB_MANAGER_METRIC_PORT,
+    METRIC_CACHE_STALE,
+    METRIC_CACHE_TTL,
+    METRIC_PUBLISH_INTERVAL,
+)
+
+from .async_socket_manager import get_generator_client, get_manager_client
+from .interface import (
+    DatabaseInterface,
+    DetailedDatabaseInterface,
+    JobInterface,
+    WorkloadInterface,
+)
+from .metric_subscriber import MetricSubscriber
+from .model import DetailedDatabase, Job, Status, Workload
+from .response_cache import AsyncResponseCache
+
+
+class AsyncWorkloadService:
+    """Asynchronous services of the Workload Controller."""
+
+    @staticmethod
+    async def _send_message_to_gen(message: Request) -> Response:
+        """Send an IPC message to the workload generator."""
+        return await get_generator_client().send_message(message)
+
+    @classmethod
+    async def get_workloads(cls) -> List[Workload]:
+        """Get all Workloads.
+
+        Returns the running Workloads.
+        """
+        response = await cls._send_message_to_gen(
+            Request(header=Header(message="get workload"), body={}),
+        )
+        return [Workload(**workload) for workload in response["body"]["workloads"]]
+
+    @classmethod
+    async def get_workload(cls, workload_name: str) -> Optional[Workload]:
+        """Get the running Workload of a name."""
+        response = await cls._send_message_to_gen(
+            Request(
+                header=Header(message="get workload"),
+                body={"workload_name": workload_name},
+            ),
+        )
+        if response["header"]["status"] != 200:
+            return None
+        return Workload(**response["body"]["workloads"][0])
+
+    @classmethod
+    async def create(cls, interface: WorkloadInterface) -> int:
+        """Create a Workload."""
+        response = await cls._send_message_to_gen(
+            Request(header=Header(message="start workload"), body=dict(interface)),
+        )
+        return response["header"]["status"]
+
+    @classmethod
+    async def delete(cls) -> int:
+        """Stop all Workloads."""
+        response = await cls._send_message_to_gen(
+            Request(header=Header(message="stop workload"), body={}),
+        )
+        return response["header"]["status"]
+
+    @classmethod
+    async def delete_workload(cls, workload_name: str) -> int:
+        """Stop the Workload of a name."""
+        response = await cls._send_message_to_gen(
+            Request(
+                header=Header(message="stop workload"),
+                body={"workload_name": workload_name},
+            ),
+        )
+        return response["header"]["status"]
+
+
+class AsyncDatabaseService:
+    """Asynchronous services of the Database Controller."""
+
+    # Metric responses of the manager, shared by all requests of the process.
+    metric_cache: AsyncResponseCache = AsyncResponseCache(
+        METRIC_CACHE_TTL, METRIC_CACHE_STALE
+    )
+    # Latest snapshot of the databases published by the manager.
+    metric_subscriber: MetricSubscriber = MetricSubscriber(
+        f"tcp://{DB_MANAGER_HOST}:{DB_MANAGER_METRIC_PORT}", METRIC_PUBLISH_INTERVAL
+    )
+
+    @staticmethod
+    async def _send_message_to_dbm(message: Request) -> Response:
+        """Send an IPC message to the database manager."""
+        return await get_manager_client().send_message(message)
+
+    @classmethod
+    async def _send_cached_message_to_dbm(cls, message: Request) -> Response:
+        """Send an IPC message to the database manager, unless it is cached."""
+        return await cls.metric_cache.get(
+            message["header"]["message"], lambda: cls._send_message_to_dbm(message)
+        )
+
+    @classmethod
+    def get_metric_cache_statistics(cls) -> List[Dict]:
+        """Get the hit ratio of the cached metrics."""
+        return cls.metric_cache.get_statistics()
+
+    @classmethod
+    async def get_databases(cls) -> List[DetailedDatabase]:
+        """Get all Databases.
+
+        Returns a list of all databases with detailed information.
+        """
+        response = await cls._send_message_to_dbm(
+            Request(header=Header(message="get databases"), body={})
+        )
+        return [
+            DetailedDatabase(**interface) for interface in response["body"]["databases"]
+        ]
+
+    @classmethod
+    async def register_database(cls, interface: DetailedDatabaseInterface) -> int:
+        """Add a database to the manager."""
+        response = await cls._send_message_to_dbm(
+            Request(header=Header(message="add database"), body=dict(interface))
+        )
+        return response["header"]["status"]
+
+    @classmethod
+    async def deregister_database(cls, interface: DatabaseInterface) -> int:
+        """Remove database from manager."""
+        response = await cls._send_message_to_dbm(
+            Request(header=Header(message="delete database"), body=dict(interface))
+        )
+        return response["header"]["status"]
+
+    @classmethod
+    async def start_worker_pool(cls) -> int:
+        """Start worker pool."""
+        response = await cls._send_message_to_dbm(
+            Request(header=Header(message="start worker"), body={})
+        )
+        return response["header"]["status"]
+
+    @classmethod
+    async def close_worker_pool(cls) -> int:
+        """Close worker pool."""
+        response = await cls._send_message_to_dbm(
+            Request(header=Header(message="close worker"), body={})
+        )
+        return response["header"]["status"]
+
+    @classmethod
+    async def start_job(cls, interface: JobInterface) -> Optional[Job]:
+        """Start a call of the manager as a job.
+
+        Returns the job at once, None if the call cannot run as a job.
+        """
+        response = await cls._send_message_to_dbm(
+            Request(header=Header(message="start job"), body=dict(interface))
+        )
+        if response["header"]["status"] != 202:
+            return None
+        return Job(**response["body"]["job"])
+
+    @classmethod
+    async def get_job(cls, job_id: str) -> Optional[Job]:
+        """Get a job of the manager, None if it is unknown."""
+        response = await cls._send_message_to_dbm(
+            Request(header=Header(message="get job status"), body={"id": job_id})
+        )
+        if response["header"]["status"] != 200:
+            return None
+        return Job(**response["body"]["job"])
+
+    @classmethod
+    async def get_status(cls) -> List[Status]:
+        """Get status of all worker pools."""
+        snapshot = cls.metric_subscriber.get_snapshot()
+        if snapshot is not None:
+            return [
+                Status(database["id"], database["worker_pool_status"])
+                for database in snapshot["databases"]
+            ]
+        response = await cls._send_message_to_dbm(
+            Request(header=Header(message="status"), body={})
+        )
+        return [Status(**interface) for interface in response["body"]["status"]]
+
+    @classmethod
+    async def get_queue_length(cls) -> List[Dict]:
+        """Get queue length, capacity and dropped tasks of all databases."""
+        snapshot = cls.metric_subscriber.get_snapshot()
+        if snapshot is not None:
+            return snapshot["databases"]
+        response = await cls._send_message_to_dbm(
+            Request(header=Header(message="get queue length"), body={})
+        )
+        return response["body"]["databases"]
+
+    @classmethod
+    async def get_metrics(cls) -> List[Dict]:
+        """Get the latest sampled metrics of all databases."""
+        snapshot = cls.metric_subscriber.get_snapshot()
+        if snapshot is not None:
+            return snapshot["databases"]
+        response = await cls._send_message_to_dbm(
+            Request(header=Header(message="get metrics"), body={})
+        )
+        return response["body"]["databases"]
+
+    @classmethod
+    async def get_time_intense_metric(cls) -> Dict:
+        """Get computer intense metric from manager."""
+        _ = await cls._send_cached_message_to_dbm(
+            Request(header=Header(message="get time intense metric"), body={})
+        )
+        fake_metric_information = {
+            "customer": {"size": 10000, "number_columns": 2},
+            "supplier": {"size": 400, "number_columns": 1},
+            "throughput": 42,
+            "latency": 42,
+        }
+        return {"id": "foo", "results": fake_metric_information}
+
+    @classmethod
+    async def get_metric(cls) -> Dict:
+        """Get metric from manager."""
+        if cls.metric_subscriber.get_snapshot() is None:
+            _ = await cls._send_cached_message_to_dbm(
+                Request(header=Header(message="get metric"), body={})
+            )
+        fake_metric_information = {
+            "customer": {"size": 10000, "number_columns": 2},
+            "supplier": {"size": 400, "number_columns": 1},
+            "throughput": 42,
+            "latency": 42,
+        }
+        return {"id": "foo", "results": fake_metric_information}
+
+    @classmethod
+    async def get_flask_metric(cls) -> Dict:
+        """Get metric computed in the back-end api."""
+        await sleep(0.05)
+        fake_metric_information = {
+            "customer": {"size": 10000, "number_columns": 2},
+            "supplier": {"size": 400, "number_columns": 1},
+            "throughput": 42,
+            "latency": 42,
+        }
+        return {"id": "foo", "results": fake_metric_information}
@@ -0,0 +1,140 @@
+"""Asynchronous socket connection for the ASGI back-end api.
+
+A single DEALER socket per destination carries all concurrent requests of a
+process. Each request carries an id in its header that the server repeats in
+the reply, so replies are matched to their waiting callers regardless of the
+order in which they arrive. Malformed replies are logged and skipped. If the
+receiver stops anyway, the waiting callers fail and the next request starts a
+new receiver.
+"""
+
+from asyncio import Future, Task, TimeoutError, get_running_loop, wait_for
+from itertools import count
+from logging import getLogger
+from typing import Dict, Iterator, Optional
+
+from zmq import DEALER, LINGER
+from zmq.asyncio import Context, Socket
+
+from backend.codec import decode, encode
+from backend.request import Header, Request
+from backend.response import Response
+from backend.settings import (
+    DB_MANAGER_HOST,
+    DB_MANAGER_PORT,
+    GENERATOR_HOST,
+    GENERATOR_PORT,
+    IPC_REQUEST_TIMEOUT,
+)
+
+from .socket_manager import get_attempts, get_timeout_error
+
+logger = getLogger(__name__)
+
+
+class AsyncClient:
+    """Client multiplexing concurrent requests over one DEALER socket."""
+
+    def __init__(self, url: str) -> None:
+        """Initialize an AsyncClient."""
+        self._url: str = url
+        self._socket: Socket = Context.instance().socket(DEALER)
+        self._socket.setsockopt(LINGER, 0)
+        self._socket.connect(url)
+        self._request_ids: Iterator[int] = count()
+        self._pending: Dict[int, Future] = {}
+        self._receiver: Optional[Task] = None
+
+    async def _receive(self) -> None:
+        """Resolve the waiting caller of every incoming reply."""
+        while True:
+            frames = await self._socket.recv_multipart()
+            try:
+                response: Response = decode(frames[-1])
+                request_id = response["header"].get("id", -1)
+            except Exception:
+                logger.exception("Skipped a malformed reply from %s.", self._url)
+                continue
+            future = self._pending.pop(request_id, None)
+            if future is not None and not future.done():
+                future.set_result(response)
+
+    def _on_receiver_done(self, receiver: Task) -> None:
+        """Fail the waiting callers of a receiver that stopped."""
+        if self._receiver is receiver:
+            self._receiver = None
+        if receiver.cancelled():
+            return
+        error = receiver.exception()
+        logger.error("Receiver of %s stopped.", self._url, exc_info=error)
+        for future in self._pending.values():
+            if not future.done():
+                future.set_exception(
+                    ConnectionError(f"Receiver of {self._url} stopped")
+                )
+
+    def _start_receiver(self) -> None:
+        if self._receiver is None:
+            self._receiver = get_running_loop().create_task(self._receive())
+            self._receiver.add_done_callback(self._on_receiver_done)
+
+    async def _send_once(self, message: Request, timeout: int) -> Response:
+        request_id = next(self._request_ids)
+        header = Header(**message["header"])
+        header["id"] = request_id
+        future: Future = get_running_loop().create_future()
+        self._pending[request_id] = future
+        try:
+            await self._socket.send_multipart(
+                [b"", encode(Request(header=header, body=message["body"]))]
+            )
+            return await wait_for(future, timeout / 1000)
+        finally:
+            self._pending.pop(request_id, None)
+
+    async def send_message(
+        self, message: Request, timeout: Optional[int] = None
+    ) -> Response:
+        """Send message and wait at most timeout ms per attempt."""
+        self._start_receiver()
+        timeout = IPC_REQUEST_TIMEOUT if timeout is None else timeout
+        for _ in range(get_attempts(message)):
+            try:
+                return await self._send_once(message, timeout)
+            except TimeoutError:
+                continue
+        raise get_timeout_error(self._url, message)
+
+    def close(self) -> None:
+        """Stop receiving and close the socket."""
+        if self._receiver is not None:
+            self._receiver.cancel()
+            self._receiver = None
+        self._socket.close()
+
+
+_clients: Dict[str, AsyncClient] = {}
+
+
+def get_client(url: str) -> AsyncClient:
+    """Return the client of this process for a destination."""
+    if url not in _clients:
+        _clients[url] = AsyncClient(url)
+    return _clients[url]
+
+
+def get_generator_client() -> AsyncClient:
+    """Return the client sending requests to the generator."""
+    return get_client(f"tcp://{GENERATOR_HOST}:{GENERATOR_PORT}")
+
+
+def get_manager_client() -> AsyncClient:
+    """Return the client sending requests to the manager."""
+    return get_client(f"tcp://{DB_MANAGER_HOST}:{DB_MANAGER_PORT}")
+
+
+def close_clients() -> None:
+    """Close the clients of this process."""
+    for client in _clients.values():
+        client.close()
+    _clients.clear()
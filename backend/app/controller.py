@@ -1,5 +1,5 @@
 """CLI used to start the backend API."""
-from typing import Dict, List
+from typing import Dict, List, Tuple, Union
 
 from flask import Flask, request
 from flask.wrappers import Response
@@ -7,30 +7,51 @@ from flask_accepts import accepts, responds
 from flask_cors import CORS
 from flask_restx import Api, Resource
 
-from .interface import DatabaseInterface, DetailedDatabaseInterface, WorkloadInterface
-from .model import DetailedDatabase, Status, Workload
+from .interface import (
+    DatabaseInterface,
+    DetailedDatabaseInterface,
+    JobInterface,
+    WorkloadInterface,
+)
+from .model import DetailedDatabase, Job, Status, Workload
 from .schema import (
     DatabaseSchema,
     DetailedDatabaseSchema,
+    JobSchema,
+    MetricCacheSchema,
     MetricSchema,
+    QueueLengthSchema,
     StatusSchema,
     WorkloadSchema,
 )
 from .service import DatabaseService, WorkloadService
+from .socket_manager import RequestTimeoutError, ServiceUnavailableError
 
 app = Flask(__name__)
 CORS(app)
 api = Api(app)
 
 
+@api.errorhandler(ServiceUnavailableError)
+def handle_service_unavailable(error: ServiceUnavailableError) -> Tuple[Dict, int]:
+    """Return 503 if a component did not answer any attempt."""
+    return {"message": str(error)}, 503
+
+
+@api.errorhandler(RequestTimeoutError)
+def handle_request_timeout(error: RequestTimeoutError) -> Tuple[Dict, int]:
+    """Return 504 if a component did not answer before the deadline."""
+    return {"message": str(error)}, 504
+
+
 @api.route("/workload")
 class WorkloadController(Resource):
     """Controller of Workloads."""
 
-    @responds(schema=WorkloadSchema, api=api)
-    def get(self) -> Workload:
+    @responds(schema=WorkloadSchema(many=True), api=api)
+    def get(self) -> List[Workload]:
         """Get all Workloads."""
-        return WorkloadService.get_workload()
+        return WorkloadService.get_workloads()
 
     @accepts(schema=WorkloadSchema, api=api)
     @responds(schema=WorkloadSchema, api=api)
@@ -40,10 +61,25 @@ class WorkloadController(Resource):
         return Response(status=WorkloadService.create(interface))
 
     def delete(self) -> Response:
-        """Delete a Workload."""
+        """Delete all Workloads."""
         return Response(status=WorkloadService.delete())
 
 
+@api.route("/workload/<string:workload_name>")
+class NamedWorkloadController(Resource):
+    """Controller of a single Workload."""
+
+    @responds(schema=WorkloadSchema, api=api)
+    def get(self, workload_name: str) -> Union[Workload, Response]:
+        """Get a Workload."""
+        workload = WorkloadService.get_workload(workload_name)
+        return workload if workload is not None else Response(status=404)
+
+    def delete(self, workload_name: str) -> Response:
+        """Delete a Workload."""
+        return Response(status=WorkloadService.delete_workload(workload_name))
+
+
 @api.route("/database")
 class DatabasesController(Resource):
     """Controller for access and register databases."""
@@ -85,6 +121,31 @@ class WorkerController(Resource):
         return Response(status=status_code)
 
 
+@api.route("/jobs")
+class JobsController(Resource):
+    """Run calls of the database manager without waiting for them."""
+
+    @accepts(schema=JobSchema, api=api)
+    def post(self) -> Union[Tuple[Dict, int, Dict], Response]:
+        """Start a Job, answered before the call is finished."""
+        interface: JobInterface = request.parsed_obj
+        job = DatabaseService.start_job(interface)
+        if job is None:
+            return Response(status=400)
+        return JobSchema().dump(job), 202, {"Location": f"/jobs/{job.id}"}
+
+
+@api.route("/jobs/<string:job_id>")
+class JobController(Resource):
+    """Controller of a single Job."""
+
+    @responds(schema=JobSchema, api=api)
+    def get(self, job_id: str) -> Union[Job, Response]:
+        """Get the status of a Job."""
+        job = DatabaseService.get_job(job_id)
+        return job if job is not None else Response(status=404)
+
+
 @api.route("/status")
 class StatusController(Resource):
     """Manage status of all databases."""
@@ -95,6 +156,16 @@ class StatusController(Resource):
         return DatabaseService.get_status()
 
 
+@api.route("/queue_length")
+class QueueLengthController(Resource):
+    """Manage task queues of all databases."""
+
+    @responds(schema=QueueLengthSchema(many=True), api=api)
+    def get(self) -> List[Dict]:
+        """Return queue length for all databases."""
+        return DatabaseService.get_queue_length()
+
+
 @api.route("/manager_time_intense_metric")
 class ManagerTimeIntenseMetricController(Resource):
     """Return storage information of database."""
@@ -115,6 +186,16 @@ class ManagerMetricController(Resource):
         return DatabaseService.get_metric()
 
 
+@api.route("/metric_cache")
+class MetricCacheController(Resource):
+    """Statistics of the metric cache of this process."""
+
+    @responds(schema=MetricCacheSchema(many=True), api=api)
+    def get(self) -> List[Dict]:
+        """Return the requests and hit ratio of every cached metric."""
+        return DatabaseService.get_metric_cache_statistics()
+
+
 @api.route("/flask_metric")
 class FlaskMetricController(Resource):
     """Return storage information of database."""
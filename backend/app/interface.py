@@ -1,6 +1,6 @@
 """Interface for back-end api."""
 
-from typing import TypedDict
+from typing import Dict, List, Optional, TypedDict
 
 
 class WorkloadInterface(TypedDict):
@@ -8,6 +8,18 @@ class WorkloadInterface(TypedDict):
 
     workload_name: str
     frequency: int
+    databases: List[str]
+    arrivals: str
+    trace: Optional[str]
+    speed: float
+    loop: bool
+
+
+class JobInterface(TypedDict):
+    """Interface of a Job."""
+
+    message: str
+    body: Dict
 
 
 class DatabaseInterface(TypedDict):
@@ -0,0 +1,86 @@
+"""Live metrics pushed to the clients of an ASGI process as server-sent events.
+
+While clients are connected, the metrics are fetched once every interval and
+the same event is sent to all of them, so the manager is asked once per tick
+regardless of the number of clients. A new client gets the latest event at
+once. Failed fetches are sent as error events and the stream goes on. A stream
+never ends, so it is not offered by the WSGI app, where it would hold a thread.
+"""
+from asyncio import Future, Task, get_running_loop, shield, sleep
+from json import dumps
+from logging import getLogger
+from time import monotonic, time
+from typing import Any, AsyncIterator, Awaitable, Callable, List, Optional, Set
+
+logger = getLogger(__name__)
+
+
+def format_event(event: str, data: Any) -> str:
+    """Return a server-sent event with JSON data."""
+    return f"event: {event}\ndata: {dumps(data)}\n\n"
+
+
+def format_metrics(databases: List) -> str:
+    """Return the event with the metrics of all databases."""
+    return format_event("metrics", {"timestamp": time(), "databases": databases})
+
+
+def format_error(error: Exception) -> str:
+    """Return the event sent instead of the metrics of a failed fetch."""
+    return format_event("error", {"message": str(error)})
+
+
+class AsyncMetricStream:
+    """Stream for the coroutines of an ASGI process."""
+
+    def __init__(self, interval: int, fetch: Callable[[], Awaitable[List]]) -> None:
+        """Initialize an AsyncMetricStream fetching every interval milliseconds."""
+        self._interval: float = interval / 1000
+        self._fetch: Callable[[], Awaitable[List]] = fetch
+        self._latest: Optional[str] = None
+        # Resolved with the next event, replaced every interval.
+        self._next: Optional[Future] = None
+        self._clients: int = 0
+        # The loop keeps weak references to tasks only.
+        self._tasks: Set[Task] = set()
+
+    def _on_run_done(self, task: Task) -> None:
+        self._tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error("The metric stream stopped.", exc_info=task.exception())
+
+    async def _get_event(self) -> str:
+        try:
+            return format_metrics(await self._fetch())
+        except Exception as error:
+            return format_error(error)
+
+    async def _run(self) -> None:
+        """Fetch the metrics every interval until the last client left."""
+        while self._clients > 0:
+            start = monotonic()
+            self._latest = await self._get_event()
+            next_event, self._next = self._next, get_running_loop().create_future()
+            if next_event is not None:
+                next_event.set_result(self._latest)
+            await sleep(max(0.0, self._interval - (monotonic() - start)))
+        self._next = None
+        self._latest = None
+
+    async def subscribe(self) -> AsyncIterator[str]:
+        """Yield the events until the client disconnects."""
+        self._clients += 1
+        if self._next is None:
+            self._next = get_running_loop().create_future()
+            task = get_running_loop().create_task(self._run())
+            self._tasks.add(task)
+            task.add_done_callback(self._on_run_done)
+        try:
+            if self._latest is not None:
+                yield self._latest
+            # The stream only stops without clients.
+            while self._next is not None:
+                # Disconnecting clients must not cancel the event of the others.
+                yield await shield(self._next)
+        finally:
+            self._clients -= 1
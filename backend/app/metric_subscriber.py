@@ -0,0 +1,68 @@
+"""Subscriber keeping the latest metric snapshot published by the manager.
+
+The snapshot is received by a thread of every back-end process, so requests for
+the status or the metrics of the databases are answered from memory. Without a
+snapshot of the last two intervals the services fall back to asking the
+manager, for example right after the start or while the manager is down.
+"""
+from os import getpid
+from threading import Event, Lock, Thread
+from time import monotonic
+from typing import Optional, Tuple
+
+from zmq import SUB, SUBSCRIBE, Context
+
+from backend.codec import decode
+from backend.request import Body
+
+# Milliseconds the subscriber waits for snapshots before it checks for closing.
+SUBSCRIBER_TIMEOUT = 100
+
+
+class MetricSubscriber:
+    """Latest snapshot of the databases, disabled without an interval."""
+
+    def __init__(self, publisher_url: str, interval: int) -> None:
+        """Initialize a MetricSubscriber with the interval of the publisher."""
+        self._publisher_url: str = publisher_url
+        self._interval: int = interval
+        # Time the latest snapshot was received at and the snapshot.
+        self._latest: Tuple[float, Optional[Body]] = (0.0, None)
+        self._lock: Lock = Lock()
+        self._pid: Optional[int] = None
+        self._closed: Event = Event()
+
+    def _start(self) -> None:
+        """Start receiving in this process, threads do not survive a fork."""
+        with self._lock:
+            if self._pid == getpid():
+                return
+            self._pid = getpid()
+            self._latest = (0.0, None)
+            Thread(target=self._receive, daemon=True).start()
+
+    def _receive(self) -> None:
+        sub_socket = Context.instance().socket(SUB)
+        sub_socket.setsockopt(SUBSCRIBE, b"")
+        sub_socket.connect(self._publisher_url)
+        try:
+            while not self._closed.is_set():
+                if sub_socket.poll(SUBSCRIBER_TIMEOUT):
+                    snapshot: Body = decode(sub_socket.recv())["body"]
+                    self._latest = (monotonic(), snapshot)
+        finally:
+            sub_socket.close()
+
+    def get_snapshot(self) -> Optional[Body]:
+        """Return the latest snapshot, None if there is no recent one."""
+        if self._interval <= 0:
+            return None
+        self._start()
+        received, snapshot = self._latest
+        if monotonic() - received > 2 * self._interval / 1000:
+            return None
+        return snapshot
+
+    def close(self) -> None:
+        """Stop receiving snapshots."""
+        self._closed.set()
@@ -1,13 +1,50 @@
 """Model for back-end api."""
 
+from typing import Dict, List, Optional
+
 
 class Workload:
     """Model of a Workload."""
 
-    def __init__(self, workload_name: str, frequency: int):
+    def __init__(
+        self,
+        workload_name: str,
+        frequency: int = 0,
+        databases: Optional[List[str]] = None,
+        arrivals: str = "uniform",
+        trace: Optional[str] = None,
+        speed: float = 1.0,
+        loop: bool = False,
+    ):
         """Initialize a Workload model."""
         self.workload_name: str = workload_name
         self.frequency: int = frequency
+        self.databases: List[str] = databases or []
+        self.arrivals: str = arrivals
+        self.trace: Optional[str] = trace
+        self.speed: float = speed
+        self.loop: bool = loop
+
+
+class Job:
+    """Model of a Job running a call of the database manager."""
+
+    def __init__(
+        self,
+        id: str,
+        message: str,
+        status: str,
+        submitted: float,
+        finished: Optional[float] = None,
+        response: Optional[Dict] = None,
+    ):
+        """Initialize a Job model."""
+        self.id: str = id
+        self.message: str = message
+        self.status: str = status
+        self.submitted: float = submitted
+        self.finished: Optional[float] = finished
+        self.response: Optional[Dict] = response
 
 
 class Database:
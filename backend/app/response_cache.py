@@ -0,0 +1,181 @@
+"""Cache of responses of the components, shared by all requests of a process.
+
+A cached response is fresh for ttl milliseconds. For stale milliseconds after
+that it is still returned, while a single call refreshes it in the background.
+Requests arriving while a response is fetched wait for that call instead of
+sending their own, so concurrent requests cause one call to the component.
+"""
+from asyncio import Future as AsyncFuture
+from asyncio import Task, get_running_loop, shield
+from concurrent.futures import Future
+from logging import getLogger
+from threading import Lock, Thread
+from time import monotonic
+from typing import Awaitable, Callable, Dict, List, Optional, Set, Tuple, Union
+
+from backend.response import Response
+
+logger = getLogger(__name__)
+
+# Outcomes of a request counted for the statistics.
+OUTCOMES = ("hits", "stale_hits", "coalesced", "misses")
+EMPTY_RESPONSE: Response = {"header": {"status": 0, "message": ""}, "body": {}}
+
+
+class _ResponseCache:
+    """Entries and statistics shared by the synchronous and asynchronous cache."""
+
+    def __init__(self, ttl: int, stale: int = 0) -> None:
+        """Initialize an empty cache, disabled without a ttl."""
+        self._ttl: float = ttl / 1000
+        self._stale: float = stale / 1000
+        self._entries: Dict[str, Tuple[float, Response]] = {}
+        self._statistics: Dict[str, Dict[str, int]] = {}
+
+    @property
+    def enabled(self) -> bool:
+        """Return if responses are cached at all."""
+        return self._ttl > 0
+
+    def _lookup(self, key: str) -> Tuple[str, Response]:
+        """Return if the entry of a key is fresh, stale or missing and its value."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return "missing", EMPTY_RESPONSE
+        age = monotonic() - entry[0]
+        if age < self._ttl:
+            return "fresh", entry[1]
+        if age < self._ttl + self._stale:
+            return "stale", entry[1]
+        return "missing", EMPTY_RESPONSE
+
+    def _store(self, key: str, value: Response) -> None:
+        self._entries[key] = (monotonic(), value)
+
+    def _count(self, key: str, outcome: str) -> None:
+        statistics = self._statistics.setdefault(
+            key, {outcome: 0 for outcome in OUTCOMES}
+        )
+        statistics[outcome] += 1
+
+    def get_statistics(self) -> List[Dict[str, Union[str, int, float]]]:
+        """Return the outcomes and the hit ratio of the requests of every key.
+
+        Stale hits and requests waiting for a running call count as hits.
+        """
+        statistics: List[Dict[str, Union[str, int, float]]] = []
+        for key, outcomes in list(self._statistics.items()):
+            requests = sum(outcomes.values())
+            hits = requests - outcomes["misses"]
+            statistics.append(
+                {
+                    "key": key,
+                    "requests": requests,
+                    **outcomes,
+                    "hit_ratio": round(hits / requests, 4) if requests else 0.0,
+                }
+            )
+        return statistics
+
+
+class ResponseCache(_ResponseCache):
+    """Cache for the threads of a WSGI process."""
+
+    def __init__(self, ttl: int, stale: int = 0) -> None:
+        """Initialize an empty cache, disabled without a ttl."""
+        super().__init__(ttl, stale)
+        self._lock: Lock = Lock()
+        self._running: Dict[str, Future] = {}
+
+    def get(self, key: str, fetch: Callable[[], Response]) -> Response:
+        """Return the cached response of a key, fetch it if needed."""
+        if not self.enabled:
+            return fetch()
+        with self._lock:
+            state, value = self._lookup(key)
+            running: Optional[Future] = self._running.get(key)
+            if state == "fresh" or state == "stale":
+                self._count(key, "hits" if state == "fresh" else "stale_hits")
+                if state == "stale" and running is None:
+                    future = self._running[key] = Future()
+                    Thread(
+                        target=self._fetch, args=(key, fetch, future), daemon=True
+                    ).start()
+                return value
+            leader = running is None
+            self._count(key, "misses" if leader else "coalesced")
+            if running is None:
+                running = self._running[key] = Future()
+        if leader:
+            self._fetch(key, fetch, running)
+        return running.result()
+
+    def _fetch(self, key: str, fetch: Callable[[], Response], future: Future) -> None:
+        try:
+            value = fetch()
+        except Exception as error:
+            with self._lock:
+                del self._running[key]
+            future.set_exception(error)
+            return
+        with self._lock:
+            self._store(key, value)
+            del self._running[key]
+        future.set_result(value)
+
+
+class AsyncResponseCache(_ResponseCache):
+    """Cache for the coroutines of an ASGI process."""
+
+    def __init__(self, ttl: int, stale: int = 0) -> None:
+        """Initialize an empty cache, disabled without a ttl."""
+        super().__init__(ttl, stale)
+        self._running: Dict[str, AsyncFuture] = {}
+        # The loop keeps weak references to tasks only.
+        self._tasks: Set[Task] = set()
+
+    def _start_fetch(
+        self, key: str, fetch: Callable[[], Awaitable[Response]]
+    ) -> AsyncFuture:
+        """Fetch a key in a task and return the future of its response."""
+        running = self._running[key] = get_running_loop().create_future()
+        task = get_running_loop().create_task(self._fetch(key, fetch))
+        self._tasks.add(task)
+        task.add_done_callback(self._on_fetch_done)
+        return running
+
+    def _on_fetch_done(self, task: Task) -> None:
+        self._tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error("Fetching a response failed.", exc_info=task.exception())
+
+    async def get(self, key: str, fetch: Callable[[], Awaitable[Response]]) -> Response:
+        """Return the cached response of a key, fetch it if needed."""
+        if not self.enabled:
+            return await fetch()
+        state, value = self._lookup(key)
+        running: Optional[AsyncFuture] = self._running.get(key)
+        if state == "fresh" or state == "stale":
+            self._count(key, "hits" if state == "fresh" else "stale_hits")
+            if state == "stale" and running is None:
+                self._start_fetch(key, fetch)
+            return value
+        self._count(key, "misses" if running is None else "coalesced")
+        if running is None:
+            running = self._start_fetch(key, fetch)
+        # The call goes on for the other requests if this one is cancelled.
+        return await shield(running)
+
+    async def _fetch(self, key: str, fetch: Callable[[], Awaitable[Response]]) -> None:
+        future = self._running[key]
+        try:
+            value = await fetch()
+        except Exception as error:
+            del self._running[key]
+            future.set_exception(error)
+            # Mark the error as retrieved, all requests may have given up.
+            future.exception()
+            return
+        self._store(key, value)
+        del self._running[key]
+        future.set_result(value)
@@ -1,7 +1,8 @@
 """Schema for back-end api."""
 
-from marshmallow import Schema, post_load
-from marshmallow.fields import Dict, Integer, String
+from marshmallow import Schema, ValidationError, post_load, validates_schema
+from marshmallow.fields import Boolean, Dict, Float, Integer, List, String
+from marshmallow.validate import OneOf, Range
 
 from .model import Database, DetailedDatabase
 
@@ -11,7 +12,71 @@ class WorkloadSchema(Schema):
 
     workload_name = String(description="Name of the workload.", required=True,)
     frequency = Integer(
-        description="Number of queries generated per second.", required=True
+        description="Number of queries generated per second, unless replaying a trace."
+    )
+    databases = List(
+        String(),
+        description="IDs of the databases receiving the workload, all if empty.",
+        missing=list,
+        example=["hyrise-1"],
+    )
+    arrivals = String(
+        description="Arrival process of the queries, uniform or poisson.",
+        missing="uniform",
+        validate=OneOf(["uniform", "poisson"]),
+    )
+    trace = String(
+        description="File name of a recorded trace replayed instead of a frequency.",
+        missing=None,
+        allow_none=True,
+        example="production.jsonl",
+    )
+    speed = Float(
+        description="Factor the time of the trace is accelerated by.",
+        missing=1.0,
+        validate=Range(min=0, min_inclusive=False),
+    )
+    loop = Boolean(description="Start the trace over once finished.", missing=False)
+
+    @validates_schema
+    def validate_source(self, data, **kwargs):
+        """Require a frequency unless a trace is replayed."""
+        if "frequency" not in data and not data.get("trace"):
+            raise ValidationError("Either a frequency or a trace is required.")
+
+
+class JobSchema(Schema):
+    """Schema of a Job running a call of the database manager."""
+
+    id = String(description="Used to ask for the status of the job.", dump_only=True)
+    message = String(
+        description="Call of the database manager run by the job.",
+        required=True,
+        validate=OneOf(
+            [
+                "add database",
+                "delete database",
+                "start worker",
+                "close worker",
+                "get time intense metric",
+            ]
+        ),
+        example="start worker",
+    )
+    body = Dict(description="Body of the call.", missing=dict, load_only=True)
+    status = String(
+        description="One of pending, running, done, failed and cancelled.",
+        dump_only=True,
+        example="running",
+    )
+    submitted = Float(description="Time the job was started.", dump_only=True)
+    finished = Float(
+        description="Time the job was finished.", dump_only=True, allow_none=True
+    )
+    response = Dict(
+        description="Response of the call once the job is finished.",
+        dump_only=True,
+        allow_none=True,
     )
 
 
@@ -70,6 +135,34 @@ class StatusSchema(Schema):
     )
 
 
+class QueueLengthSchema(Schema):
+    """Schema of the task queue of a database."""
+
+    id = String(
+        title="Database ID",
+        description="Used to identify a database.",
+        required=True,
+        example="hyrise-1",
+    )
+    queue_length = Integer(description="Number of queued tasks.", example=42)
+    queue_capacity = Integer(
+        description="Maximum number of queued tasks, 0 is unbounded."
+    )
+    dropped_tasks = Integer(description="Tasks dropped at a full queue.")
+
+
+class MetricCacheSchema(Schema):
+    """Schema of the statistics of a cached metric."""
+
+    key = String(description="Call of the manager.", example="get metric")
+    requests = Integer(description="Requests of the metric.")
+    hits = Integer(description="Requests answered with a fresh response.")
+    stale_hits = Integer(description="Requests answered while refreshing.")
+    coalesced = Integer(description="Requests waiting for the call of another.")
+    misses = Integer(description="Requests calling the manager.")
+    hit_ratio = Float(description="Share of requests not calling the manager.")
+
+
 class MetricSchema(Schema):
     """Schema of a storage response."""
 
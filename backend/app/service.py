@@ -1,12 +1,26 @@
 """Service for back-end api."""
 from time import sleep
-from typing import Dict, List
+from typing import Dict, List, Optional
 
 from backend.request import Header, Request
 from backend.response import Response
-
-from .interface import DatabaseInterface, DetailedDatabaseInterface, WorkloadInterface
-from .model import DetailedDatabase, Status, Workload
+from backend.settings import (
+    DB_MANAGER_HOST,
+    DB_MANAGER_METRIC_PORT,
+    METRIC_CACHE_STALE,
+    METRIC_CACHE_TTL,
+    METRIC_PUBLISH_INTERVAL,
+)
+
+from .interface import (
+    DatabaseInterface,
+    DetailedDatabaseInterface,
+    JobInterface,
+    WorkloadInterface,
+)
+from .metric_subscriber import MetricSubscriber
+from .model import DetailedDatabase, Job, Status, Workload
+from .response_cache import ResponseCache
 from .socket_manager import GeneratorSocket, ManagerSocket
 
 
@@ -20,14 +34,28 @@ class WorkloadService:
             return socket.send_message(message)
 
     @classmethod
-    def get_workload(cls) -> Workload:
+    def get_workloads(cls) -> List[Workload]:
         """Get all Workloads.
+
         Returns the running Workloads.
         """
         response = cls._send_message_to_gen(
             Request(header=Header(message="get workload"), body={}),
         )
-        return Workload(**response["body"]["workload"])
+        return [Workload(**workload) for workload in response["body"]["workloads"]]
+
+    @classmethod
+    def get_workload(cls, workload_name: str) -> Optional[Workload]:
+        """Get the running Workload of a name."""
+        response = cls._send_message_to_gen(
+            Request(
+                header=Header(message="get workload"),
+                body={"workload_name": workload_name},
+            ),
+        )
+        if response["header"]["status"] != 200:
+            return None
+        return Workload(**response["body"]["workloads"][0])
 
     @classmethod
     def create(cls, interface: WorkloadInterface) -> int:
@@ -39,22 +67,52 @@ class WorkloadService:
 
     @classmethod
     def delete(cls) -> int:
-        """Stop a Workload."""
+        """Stop all Workloads."""
         response = cls._send_message_to_gen(
             Request(header=Header(message="stop workload"), body={}),
         )
         return response["header"]["status"]
 
+    @classmethod
+    def delete_workload(cls, workload_name: str) -> int:
+        """Stop the Workload of a name."""
+        response = cls._send_message_to_gen(
+            Request(
+                header=Header(message="stop workload"),
+                body={"workload_name": workload_name},
+            ),
+        )
+        return response["header"]["status"]
+
 
 class DatabaseService:
     """Services of the Database Controller."""
 
+    # Metric responses of the manager, shared by all requests of the process.
+    metric_cache: ResponseCache = ResponseCache(METRIC_CACHE_TTL, METRIC_CACHE_STALE)
+    # Latest snapshot of the databases published by the manager.
+    metric_subscriber: MetricSubscriber = MetricSubscriber(
+        f"tcp://{DB_MANAGER_HOST}:{DB_MANAGER_METRIC_PORT}", METRIC_PUBLISH_INTERVAL
+    )
+
     @staticmethod
     def _send_message_to_dbm(message: Request) -> Response:
         """Send an IPC message to the database manager."""
         with ManagerSocket() as socket:
             return socket.send_message(message)
 
+    @classmethod
+    def _send_cached_message_to_dbm(cls, message: Request) -> Response:
+        """Send an IPC message to the database manager, unless it is cached."""
+        return cls.metric_cache.get(
+            message["header"]["message"], lambda: cls._send_message_to_dbm(message)
+        )
+
+    @classmethod
+    def get_metric_cache_statistics(cls) -> List[Dict]:
+        """Get the hit ratio of the cached metrics."""
+        return cls.metric_cache.get_statistics()
+
     @classmethod
     def get_databases(cls) -> List[DetailedDatabase]:
         """Get all Databases.
@@ -100,18 +158,58 @@ class DatabaseService:
         )
         return response["header"]["status"]
 
+    @classmethod
+    def start_job(cls, interface: JobInterface) -> Optional[Job]:
+        """Start a call of the manager as a job.
+
+        Returns the job at once, None if the call cannot run as a job.
+        """
+        response = cls._send_message_to_dbm(
+            Request(header=Header(message="start job"), body=dict(interface))
+        )
+        if response["header"]["status"] != 202:
+            return None
+        return Job(**response["body"]["job"])
+
+    @classmethod
+    def get_job(cls, job_id: str) -> Optional[Job]:
+        """Get a job of the manager, None if it is unknown."""
+        response = cls._send_message_to_dbm(
+            Request(header=Header(message="get job status"), body={"id": job_id})
+        )
+        if response["header"]["status"] != 200:
+            return None
+        return Job(**response["body"]["job"])
+
     @classmethod
     def get_status(cls) -> List[Status]:
-        """Close worker pool."""
+        """Get status of all worker pools."""
+        snapshot = cls.metric_subscriber.get_snapshot()
+        if snapshot is not None:
+            return [
+                Status(database["id"], database["worker_pool_status"])
+                for database in snapshot["databases"]
+            ]
         response = cls._send_message_to_dbm(
             Request(header=Header(message="status"), body={})
         )
         return [Status(**interface) for interface in response["body"]["status"]]
 
+    @classmethod
+    def get_queue_length(cls) -> List[Dict]:
+        """Get queue length, capacity and dropped tasks of all databases."""
+        snapshot = cls.metric_subscriber.get_snapshot()
+        if snapshot is not None:
+            return snapshot["databases"]
+        response = cls._send_message_to_dbm(
+            Request(header=Header(message="get queue length"), body={})
+        )
+        return response["body"]["databases"]
+
     @classmethod
     def get_time_intense_metric(cls) -> Dict:
         """Get computer intense metric from manager."""
-        _ = cls._send_message_to_dbm(
+        _ = cls._send_cached_message_to_dbm(
             Request(header=Header(message="get time intense metric"), body={})
         )
         fake_metric_information = {
@@ -124,9 +222,10 @@ class DatabaseService:
 
     @classmethod
     def get_metric(cls) -> Dict:
-        _ = cls._send_message_to_dbm(
-            Request(header=Header(message="get metric"), body={})
-        )
+        if cls.metric_subscriber.get_snapshot() is None:
+            _ = cls._send_cached_message_to_dbm(
+                Request(header=Header(message="get metric"), body={})
+            )
         fake_metric_information = {
             "customer": {"size": 10000, "number_columns": 2},
             "supplier": {"size": 400, "number_columns": 1},
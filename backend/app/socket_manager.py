@@ -1,19 +1,153 @@
-"""Socket connection for function and entities."""
+"""Socket connection for function and entities.
 
+Sockets are taken from a pool per destination and returned after each request,
+so connections are reused across requests and threads. All pooled sockets share
+the process-wide zmq context.
+
+With IPC multiplexing enabled, all threads of a process share one DEALER
+socket per destination instead. Requests carry an id in their header and a
+background thread hands every reply to the thread waiting for that id.
+
+Every request has a deadline. If no reply arrives in time, the socket is
+replaced and idempotent requests are retried a bounded number of times
+(Lazy Pirate pattern).
+"""
+
+from itertools import count
+from logging import getLogger
+from os import getpid
+from threading import Event, Lock, Thread, local
 from types import TracebackType
-from typing import Optional, Type
+from typing import Dict, FrozenSet, Iterator, List, Optional, Type, Union
+from weakref import finalize
 
-from zmq import REQ, Context, Socket
+from zmq import (
+    DEALER,
+    EVENTS,
+    LINGER,
+    NOBLOCK,
+    POLLIN,
+    POLLOUT,
+    PULL,
+    PUSH,
+    REQ,
+    Context,
+    Again,
+    Poller,
+    Socket,
+)
 
-from backend.request import Request
+from backend.codec import decode, encode
+from backend.request import Header, Request
 from backend.response import Response
 from backend.settings import (
     DB_MANAGER_HOST,
     DB_MANAGER_PORT,
     GENERATOR_HOST,
     GENERATOR_PORT,
+    IPC_MULTIPLEXING,
+    IPC_REQUEST_RETRIES,
+    IPC_REQUEST_TIMEOUT,
 )
 
+logger = getLogger(__name__)
+
+IDEMPOTENT_MESSAGES: FrozenSet[str] = frozenset(
+    [
+        "get databases",
+        "get job status",
+        "get queue length",
+        "get metric",
+        "get metrics",
+        "get time intense metric",
+        "get workload",
+        "status",
+    ]
+)
+
+
+class RequestTimeoutError(Exception):
+    """Raised if a request was not answered before its deadline."""
+
+
+class ServiceUnavailableError(RequestTimeoutError):
+    """Raised if all attempts of an idempotent request timed out."""
+
+
+def get_attempts(message: Request) -> int:
+    """Return how often a request may be sent before giving up."""
+    if message["header"]["message"] in IDEMPOTENT_MESSAGES:
+        return IPC_REQUEST_RETRIES + 1
+    return 1
+
+
+def get_timeout_error(url: str, message: Request) -> RequestTimeoutError:
+    """Return the error for a request that was never answered."""
+    if message["header"]["message"] in IDEMPOTENT_MESSAGES:
+        return ServiceUnavailableError(f"No reply from {url}")
+    return RequestTimeoutError(f"Request to {url} timed out")
+
+
+def _is_healthy(socket: Socket) -> bool:
+    """Check if a REQ socket is ready to send a new request.
+
+    A REQ socket that sent a request without receiving the reply is stuck
+    and cannot send again.
+    """
+    return not socket.closed and bool(socket.getsockopt(EVENTS) & POLLOUT)
+
+
+class SocketPool:
+    """Thread-safe pool of connected REQ sockets to one destination."""
+
+    def __init__(self, url: str) -> None:
+        """Initialize a SocketPool."""
+        self._url: str = url
+        self._lock: Lock = Lock()
+        self._sockets: List[Socket] = []
+        self._pid: int = getpid()
+
+    def _connect(self) -> Socket:
+        socket: Socket = Context.instance().socket(REQ)
+        socket.setsockopt(LINGER, 0)
+        socket.connect(self._url)
+        return socket
+
+    def _reset_after_fork(self) -> None:
+        """Forget sockets inherited from a parent process, e.g. a gunicorn master."""
+        if self._pid != getpid():
+            self._sockets = []
+            self._pid = getpid()
+
+    def acquire(self) -> Socket:
+        """Take a healthy socket from the pool or connect a new one."""
+        with self._lock:
+            self._reset_after_fork()
+            while self._sockets:
+                socket = self._sockets.pop()
+                if _is_healthy(socket):
+                    return socket
+                socket.close()
+        return self._connect()
+
+    def release(self, socket: Socket) -> None:
+        """Return a socket to the pool."""
+        with self._lock:
+            self._reset_after_fork()
+            self._sockets.append(socket)
+
+
+_pools: Dict[str, SocketPool] = {}
+_pools_lock: Lock = Lock()
+
+
+def get_socket_pool(url: str) -> SocketPool:
+    """Return the process-wide socket pool for a destination."""
+    with _pools_lock:
+        if url not in _pools:
+            _pools[url] = SocketPool(url)
+        return _pools[url]
+
 
 class BaseSocket:
     """Base Socket that interacts directly with zmq."""
@@ -21,24 +155,196 @@ class BaseSocket:
     def __init__(self, url) -> None:
         """Initialize a BaseSocket."""
         self._url: str = url
+        self._pool: SocketPool = get_socket_pool(url)
 
     def open(self) -> None:
-        """Open socket connection."""
-        context: Context = Context(io_threads=1)
-        socket: Socket = context.socket(REQ)
-        socket.connect(self._url)
-        self._socket: Socket = socket
+        """Take a connected socket from the pool."""
+        self._socket: Socket = self._pool.acquire()
 
     def close(self) -> None:
-        """Close socket connection."""
-        self._socket.disconnect(self._url)
+        """Return the socket to the pool."""
+        self._pool.release(self._socket)
+
+    def _reconnect(self) -> None:
+        """Replace a socket that is stuck waiting for a reply."""
         self._socket.close()
+        self._socket = self._pool.acquire()
+
+    def send_req(self, message: Request, timeout: Optional[int] = None) -> Response:
+        """Send message to socket and wait at most timeout ms per attempt."""
+        timeout = IPC_REQUEST_TIMEOUT if timeout is None else timeout
+        for _ in range(get_attempts(message)):
+            self._socket.send(encode(message))
+            if self._socket.poll(timeout, POLLIN):
+                response: Response = decode(self._socket.recv())
+                return response
+            self._reconnect()
+        raise get_timeout_error(self._url, message)
+
+
+class _PendingRequest:
+    """A request waiting for its reply."""
+
+    def __init__(self) -> None:
+        """Initialize a _PendingRequest."""
+        self.answered: Event = Event()
+        self.response: Optional[Response] = None
+
+
+class _Inbox:
+    """PUSH socket of one thread, closed once the thread is gone."""
+
+    def __init__(self, url: str) -> None:
+        """Initialize an _Inbox connected to the outbox of a client."""
+        self.socket: Socket = Context.instance().socket(PUSH)
+        self.socket.setsockopt(LINGER, 0)
+        self.socket.connect(url)
+        # The thread-local storage of a thread is released when it ends.
+        finalize(self, self.socket.close)
+
+
+# Numbers of the inproc outboxes, a rebuilt client must not reuse an address.
+_outbox_ids: Iterator[int] = count()
+
+
+class MultiplexedClient:
+    """Client sharing one DEALER socket between all threads of a process.
+
+    Threads hand their requests over thread-local inproc PUSH sockets to an I/O
+    thread, which owns the DEALER socket and dispatches replies by request id.
+    Malformed replies are logged and skipped. Requests handed over while the
+    I/O thread is gone time out instead of blocking the calling thread.
+    """
+
+    def __init__(self, url: str) -> None:
+        """Initialize a MultiplexedClient and start its I/O thread."""
+        self._url: str = url
+        self._outbox_url: str = f"inproc://multiplexed-{next(_outbox_ids)}"
+        self._lock: Lock = Lock()
+        self._pending: Dict[int, _PendingRequest] = {}
+        self._request_ids: Iterator[int] = count()
+        self._local: local = local()
+        self._bound: Event = Event()
+        self._thread: Thread = Thread(target=self._run, daemon=True)
+        self._thread.start()
+        self._bound.wait()
+
+    def _run(self) -> None:
+        # Sockets are used by the thread creating them only.
+        outbox: Socket = Context.instance().socket(PULL)
+        outbox.bind(self._outbox_url)
+        self._bound.set()
+        dealer: Socket = Context.instance().socket(DEALER)
+        dealer.setsockopt(LINGER, 0)
+        dealer.connect(self._url)
+        poller = Poller()
+        poller.register(outbox, POLLIN)
+        poller.register(dealer, POLLIN)
+        try:
+            while True:
+                events = dict(poller.poll())
+                if outbox in events:
+                    dealer.send_multipart([b"", outbox.recv()])
+                if dealer in events:
+                    self._dispatch(dealer.recv_multipart()[-1])
+        finally:
+            outbox.close()
+            dealer.close()
+
+    def _dispatch(self, frame: bytes) -> None:
+        try:
+            response: Response = decode(frame)
+            request_id = response["header"].get("id", -1)
+        except Exception:
+            logger.exception("Skipped a malformed reply from %s.", self._url)
+            return
+        with self._lock:
+            pending = self._pending.pop(request_id, None)
+        if pending is not None:
+            pending.response = response
+            pending.answered.set()
+
+    def _get_inbox(self) -> Socket:
+        """Return the PUSH socket of the calling thread."""
+        if not hasattr(self._local, "inbox"):
+            self._local.inbox = _Inbox(self._outbox_url)
+        return self._local.inbox.socket
+
+    def _send_once(self, message: Request, timeout: int) -> Optional[Response]:
+        request_id = next(self._request_ids)
+        header = Header(**message["header"])
+        header["id"] = request_id
+        pending = _PendingRequest()
+        with self._lock:
+            self._pending[request_id] = pending
+        try:
+            # Without the I/O thread there is no peer and a send would block.
+            self._get_inbox().send(
+                encode(Request(header=header, body=message["body"])), NOBLOCK
+            )
+        except Again:
+            pass
+        else:
+            pending.answered.wait(timeout / 1000)
+        with self._lock:
+            self._pending.pop(request_id, None)
+        return pending.response
+
+    def is_alive(self) -> bool:
+        """Return whether the I/O thread is still running."""
+        return self._thread.is_alive()
+
+    def send_req(self, message: Request, timeout: Optional[int] = None) -> Response:
+        """Send message and wait at most timeout ms per attempt."""
+        timeout = IPC_REQUEST_TIMEOUT if timeout is None else timeout
+        for _ in range(get_attempts(message)):
+            response = self._send_once(message, timeout)
+            if response is not None:
+                return response
+        raise get_timeout_error(self._url, message)
+
+
+_clients: Dict[str, MultiplexedClient] = {}
+_clients_lock: Lock = Lock()
+_clients_pid: int = getpid()
+
+
+def get_multiplexed_client(url: str) -> MultiplexedClient:
+    """Return the multiplexed client of this process for a destination."""
+    global _clients_pid
+    with _clients_lock:
+        if _clients_pid != getpid():
+            # The I/O threads of a parent process do not survive a fork.
+            _clients.clear()
+            _clients_pid = getpid()
+        if url not in _clients or not _clients[url].is_alive():
+            _clients[url] = MultiplexedClient(url)
+        return _clients[url]
+
+
+class MultiplexedSocket:
+    """Socket sending requests over the shared multiplexed client."""
+
+    def __init__(self, url: str) -> None:
+        """Initialize a MultiplexedSocket."""
+        self._client: MultiplexedClient = get_multiplexed_client(url)
+
+    def open(self) -> None:
+        """Do nothing, the shared connection stays open."""
+
+    def close(self) -> None:
+        """Do nothing, the shared connection stays open."""
+
+    def send_req(self, message: Request, timeout: Optional[int] = None) -> Response:
+        """Send message over the shared connection."""
+        return self._client.send_req(message, timeout)
+
 
-    def send_req(self, message: Request) -> Response:
-        """Send message to socket."""
-        self._socket.send_json(message)
-        response: Response = self._socket.recv_json()
-        return response
+def create_socket(url: str) -> Union[BaseSocket, MultiplexedSocket]:
+    """Create the socket type selected by the settings."""
+    if IPC_MULTIPLEXING:
+        return MultiplexedSocket(url)
+    return BaseSocket(url)
 
 
 class GeneratorSocket:
@@ -46,7 +352,7 @@ class GeneratorSocket:
 
     def __init__(self) -> None:
         """Initialize a GeneratorSocket."""
-        self._socket: BaseSocket = BaseSocket(
+        self._socket: Union[BaseSocket, MultiplexedSocket] = create_socket(
             f"tcp://{GENERATOR_HOST}:{GENERATOR_PORT}"
         )
         self._socket.open()
@@ -65,9 +371,9 @@ class GeneratorSocket:
         self._socket.close()
         return None
 
-    def send_message(self, message: Request) -> Response:
+    def send_message(self, message: Request, timeout: Optional[int] = None) -> Response:
         """Send message to generator."""
-        return self._socket.send_req(message)
+        return self._socket.send_req(message, timeout)
 
 
 class ManagerSocket:
@@ -75,7 +381,7 @@ class ManagerSocket:
 
     def __init__(self) -> None:
         """Initialize a ManagerSocket."""
-        self._socket: BaseSocket = BaseSocket(
+        self._socket: Union[BaseSocket, MultiplexedSocket] = create_socket(
             f"tcp://{DB_MANAGER_HOST}:{DB_MANAGER_PORT}"
         )
         self._socket.open()
@@ -94,6 +400,6 @@ class ManagerSocket:
         self._socket.close()
         return None
 
-    def send_message(self, message: Request) -> Response:
+    def send_message(self, message: Request, timeout: Optional[int] = None) -> Response:
         """Send message to manager."""
-        return self._socket.send_req(message)
+        return self._socket.send_req(message, timeout)
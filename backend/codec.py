@@ -0,0 +1,56 @@
+"""Codecs for the IPC wire format.
+
+Every IPC message is encoded to bytes by the codec configured with the IPC_CODEC
+setting. JSON is the default. msgpack is a compact binary alternative that is
+cheaper to encode and decode for large query lists. All components of one
+deployment have to use the same codec.
+"""
+from functools import partial
+from json import dumps, loads
+from typing import Any, Callable, Dict, NamedTuple
+
+from backend.settings import IPC_CODEC
+
+
+class Codec(NamedTuple):
+    """Pair of functions converting IPC messages from and to bytes."""
+
+    name: str
+    encode: Callable[[Any], bytes]
+    decode: Callable[[bytes], Any]
+
+
+def _encode_json(data: Any) -> bytes:
+    return dumps(data, separators=(",", ":")).encode()
+
+
+def _create_json_codec() -> Codec:
+    return Codec("json", _encode_json, loads)
+
+
+def _create_msgpack_codec() -> Codec:
+    from msgpack import packb, unpackb
+
+    return Codec(
+        "msgpack", partial(packb, use_bin_type=True), partial(unpackb, raw=False)
+    )
+
+
+_codec_factories: Dict[str, Callable[[], Codec]] = {
+    "json": _create_json_codec,
+    "msgpack": _create_msgpack_codec,
+}
+
+CODEC_NAMES = list(_codec_factories)
+
+
+def get_codec(name: str) -> Codec:
+    """Return the codec with the given name."""
+    if name not in _codec_factories:
+        raise ValueError(f"Unknown IPC codec {name}, choose one of {CODEC_NAMES}")
+    return _codec_factories[name]()
+
+
+_codec: Codec = get_codec(IPC_CODEC)
+encode: Callable[[Any], bytes] = _codec.encode
+decode: Callable[[bytes], Any] = _codec.decode
@@ -55,3 +55,7 @@ elif platform.startswith("darwin"):
         def close(self):
             """Clsoe queue."""
             self.queue.close()
+
+        def cancel_join_thread(self):
+            """Do not wait for buffered elements when the process exits."""
+            self.queue.cancel_join_thread()
@@ -1,36 +1,115 @@
-"""The BackgroundJobManager is managing the background jobs for the apscheduler."""
-from time import sleep
+"""The BackgroundJobManager is managing the background jobs for the apscheduler.
+
+The jobs sample the task queue and the worker processes of a database into its
+metric cache.
+"""
+from os import sysconf
+from time import time
+from typing import List, Optional, Tuple, Union
 
 from apscheduler.schedulers.background import BackgroundScheduler
 
+from .metric_cache import MetricCache
+from .worker_pool.pool import WorkerPool
+from .worker_pool.shared_pool import PoolShare
+
+# Seconds between two samples of the task queue and of the worker processes.
+QUEUE_SAMPLE_INTERVAL = 0.1
+SYSTEM_SAMPLE_INTERVAL = 1
+# Number of queue samples the throughput is averaged over.
+THROUGHPUT_WINDOW = 10
+CLOCK_TICKS = sysconf("SC_CLK_TCK")
+PAGE_SIZE = sysconf("SC_PAGE_SIZE")
+
+
+def read_process_usage(pid: int) -> Optional[Tuple[float, int]]:
+    """Return CPU seconds and resident memory in bytes of a process.
+
+    Returns None if the process is gone or /proc is not available.
+    """
+    try:
+        with open(f"/proc/{pid}/stat") as file:
+            fields = file.read().rsplit(")", 1)[1].split()
+    except (OSError, IndexError):
+        return None
+    cpu_seconds = (int(fields[11]) + int(fields[12])) / CLOCK_TICKS
+    return cpu_seconds, int(fields[21]) * PAGE_SIZE
+
 
-def update_queue_length():
-    """Update queue length."""
-    # Do some work
-    sleep(0.1)
+def update_queue_length(
+    worker_pool: Union[WorkerPool, PoolShare], metric_cache: MetricCache
+) -> None:
+    """Sample queue length, dropped tasks and throughput."""
+    timestamp = time()
+    taken_tasks = worker_pool.get_taken_tasks()
+    previous = metric_cache.get_queue_sample(THROUGHPUT_WINDOW - 1)
+    elapsed = timestamp - previous["timestamp"]
+    throughput = 0.0
+    if previous["timestamp"] and elapsed > 0:
+        throughput = (taken_tasks - previous["taken_tasks"]) / elapsed
+    metric_cache.add_queue_sample(
+        {
+            "timestamp": timestamp,
+            "queue_length": worker_pool.get_queue_length(),
+            "dropped_tasks": worker_pool.get_dropped_tasks(),
+            "taken_tasks": taken_tasks,
+            "throughput": round(max(throughput, 0.0), 1),
+        }
+    )
 
 
-def update_system_data():
-    """Update system data."""
-    # Do some work
-    sleep(0.5)
+def update_system_data(
+    worker_pool: Union[WorkerPool, PoolShare], metric_cache: MetricCache
+) -> None:
+    """Sample CPU and memory usage of the worker processes."""
+    timestamp = time()
+    usages: List[Tuple[float, int]] = [
+        usage
+        for usage in map(read_process_usage, worker_pool.get_worker_pids())
+        if usage is not None
+    ]
+    cpu_seconds = sum(cpu for cpu, _ in usages)
+    previous = metric_cache.get_system_sample()
+    elapsed = timestamp - previous["timestamp"]
+    cpu_percent = 0.0
+    if previous["timestamp"] and elapsed > 0:
+        # Restarted workers start over, so their first interval is skipped.
+        cpu_percent = max(cpu_seconds - previous["cpu_seconds"], 0.0) / elapsed * 100
+    metric_cache.add_system_sample(
+        {
+            "timestamp": timestamp,
+            "cpu_seconds": cpu_seconds,
+            "cpu_percent": round(cpu_percent, 1),
+            "rss_bytes": sum(rss for _, rss in usages),
+        }
+    )
 
 
 class BackgroundJobManager(object):
     """Manage background scheduling jobs."""
 
-    def __init__(self):
+    def __init__(
+        self, worker_pool: Union[WorkerPool, PoolShare], metric_cache: MetricCache
+    ):
         """Initialize BackgroundJobManager object."""
+        self._worker_pool: Union[WorkerPool, PoolShare] = worker_pool
+        self._metric_cache: MetricCache = metric_cache
         self._scheduler: BackgroundScheduler = BackgroundScheduler()
         self._init_jobs()
 
     def _init_jobs(self) -> None:
         """Initialize basic background jobs."""
         self._update_queue_length_job = self._scheduler.add_job(
-            func=update_queue_length, trigger="interval", seconds=1,
+            func=update_queue_length,
+            trigger="interval",
+            seconds=QUEUE_SAMPLE_INTERVAL,
+            args=(self._worker_pool, self._metric_cache),
         )
         self._update_system_data_job = self._scheduler.add_job(
-            func=update_system_data, trigger="interval", seconds=1,
+            func=update_system_data,
+            trigger="interval",
+            seconds=SYSTEM_SAMPLE_INTERVAL,
+            args=(self._worker_pool, self._metric_cache),
         )
 
     def start(self) -> None:
@@ -42,3 +121,4 @@ class BackgroundJobManager(object):
         self._update_system_data_job.remove()
         self._update_queue_length_job.remove()
         self._scheduler.shutdown()
+        return None
@@ -1,22 +1,149 @@
 """CLI used to start the database manager."""
+from argparse import ArgumentParser, Namespace
+
 from backend.settings import (
+    DB_MANAGER_FAN_OUT_TIMEOUT,
+    DB_MANAGER_IO_THREADS,
     DB_MANAGER_LISTENING,
+    DB_MANAGER_METRIC_PORT,
     DB_MANAGER_PORT,
+    DB_MANAGER_PROCESSES,
+    DB_MANAGER_WORKERS,
+    METRIC_PUBLISH_INTERVAL,
+    REUSE_WORKER_PROCESSES,
+    RING_BUFFER_TASK_SIZE,
+    SHARED_POOL_PROCESSES,
+    TASK_BATCH_SIZE,
+    TASK_QUEUE_CAPACITY,
+    TASK_QUEUE_POLICY,
+    TASK_QUEUE_TYPE,
     WORKLOAD_PUBSUB_PORT,
     WORKLOAD_SUB_HOST,
 )
 
 from .manager import DatabaseManager
+from .worker_pool.pool import QUEUE_POLICIES
+
+
+def parse_arguments() -> Namespace:
+    """Parse the command line arguments of the database manager."""
+    parser = ArgumentParser(description="Start the database manager.")
+    parser.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        default=DB_MANAGER_WORKERS,
+        help="Number of worker threads handling requests. "
+        "More than one starts the server in broker mode.",
+    )
+    parser.add_argument(
+        "-t",
+        "--threads",
+        type=int,
+        default=DB_MANAGER_IO_THREADS,
+        help="Number of zmq I/O threads.",
+    )
+    parser.add_argument(
+        "-p",
+        "--processes",
+        type=int,
+        default=DB_MANAGER_PROCESSES,
+        help="Number of worker processes handling stateless requests. "
+        "Requests changing databases stay serialized in the manager process.",
+    )
+    parser.add_argument(
+        "-b",
+        "--batch-size",
+        type=int,
+        default=TASK_BATCH_SIZE,
+        help="Maximum number of tasks moved through the task queue at once.",
+    )
+    parser.add_argument(
+        "-q",
+        "--queue",
+        choices=["queue", "ring_buffer"],
+        default=TASK_QUEUE_TYPE,
+        help="Task queue between the workers, a multiprocessing queue or a "
+        "ring buffer in shared memory.",
+    )
+    parser.add_argument(
+        "--ring-task-size",
+        type=int,
+        default=RING_BUFFER_TASK_SIZE,
+        help="Bytes per task of a ring buffer slot, which holds one batch. "
+        "Larger batches are dropped.",
+    )
+    parser.add_argument(
+        "-r",
+        "--reuse-processes",
+        action="store_true",
+        default=REUSE_WORKER_PROCESSES,
+        help="Pause the worker processes of a pool when it is closed and "
+        "resume them on the next start instead of forking new ones.",
+    )
+    parser.add_argument(
+        "-s",
+        "--shared-pool",
+        type=int,
+        default=SHARED_POOL_PROCESSES,
+        help="Number of execute processes shared by all databases, "
+        "usually the number of cores. 0 gives every database its own processes.",
+    )
+    parser.add_argument(
+        "-c",
+        "--capacity",
+        type=int,
+        default=TASK_QUEUE_CAPACITY,
+        help="Maximum number of queued tasks per database, 0 is unbounded.",
+    )
+    parser.add_argument(
+        "-d",
+        "--deadline",
+        type=int,
+        default=DB_MANAGER_FAN_OUT_TIMEOUT,
+        help="Milliseconds to wait for an operation on all databases, "
+        "which runs concurrently for every database.",
+    )
+    parser.add_argument(
+        "--policy",
+        choices=QUEUE_POLICIES,
+        default=TASK_QUEUE_POLICY,
+        help="Drop the newest or the oldest tasks at a full queue, or block "
+        "the feeder thread of the database until the workers made space.",
+    )
+    parser.add_argument(
+        "-m",
+        "--metric-interval",
+        type=int,
+        default=METRIC_PUBLISH_INTERVAL,
+        help="Milliseconds between two published metric snapshots of all "
+        "databases, 0 publishes none.",
+    )
+    return parser.parse_args()
 
 
 def main() -> None:
     """Create and start a database manager."""
+    arguments = parse_arguments()
     try:
         with DatabaseManager(
             DB_MANAGER_LISTENING,
             DB_MANAGER_PORT,
             WORKLOAD_SUB_HOST,
             WORKLOAD_PUBSUB_PORT,
+            number_workers=arguments.workers,
+            io_threads=arguments.threads,
+            number_processes=arguments.processes,
+            task_batch_size=arguments.batch_size,
+            task_queue_type=arguments.queue,
+            reuse_processes=arguments.reuse_processes,
+            shared_pool_processes=arguments.shared_pool,
+            task_queue_capacity=arguments.capacity,
+            task_queue_policy=arguments.policy,
+            fan_out_timeout=arguments.deadline,
+            metric_pub_port=DB_MANAGER_METRIC_PORT,
+            metric_publish_interval=arguments.metric_interval,
+            ring_buffer_task_size=arguments.ring_task_size,
         ) as database_manager:
             print(
                 f"Database manager running on port {DB_MANAGER_PORT} (Press CTRL+C to quit)"
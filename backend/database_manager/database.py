@@ -1,26 +1,86 @@
 """The database object represents the instance of a database."""
+from threading import Lock
+from typing import Dict, List, Optional, Union
+
 from .background_scheduler import BackgroundJobManager
+from .metric_cache import MetricCache
+from .worker_pool.batch import EncodedBatch
+from .worker_pool.feeder import TaskFeeder
 from .worker_pool.pool import WorkerPool
+from .worker_pool.shared_pool import PoolShare, SharedWorkerPool
 
 
 class Database(object):
     """Represents database."""
 
     def __init__(
-        self, id: str, number_workers: int, workload_publisher_url: str,
+        self,
+        id: str,
+        number_workers: int,
+        task_queue_type: str = "queue",
+        reuse_processes: bool = False,
+        shared_pool: Optional[SharedWorkerPool] = None,
+        queue_capacity: int = 0,
+        queue_policy: str = "drop_newest",
+        slot_size: int = 4096,
     ) -> None:
         """Initialize database object."""
         self._id = id
         self.number_workers: int = number_workers
-        self._worker_pool: WorkerPool = WorkerPool(
-            self.number_workers, self._id, workload_publisher_url,
+        self._worker_pool: Union[WorkerPool, PoolShare]
+        if shared_pool is not None:
+            self._worker_pool = PoolShare(shared_pool, self._id, self.number_workers)
+        else:
+            self._worker_pool = WorkerPool(
+                self.number_workers,
+                self._id,
+                task_queue_type,
+                reuse_processes,
+                queue_capacity,
+                queue_policy,
+                slot_size,
+            )
+        # Blocking puts wait in a thread of this database, not in the caller.
+        self._feeder: Optional[TaskFeeder] = (
+            TaskFeeder(self._worker_pool, queue_capacity)
+            if queue_policy == "block" and queue_capacity > 0
+            else None
+        )
+        # Serializes operations on the workers, which may outlive their request.
+        self._worker_lock: Lock = Lock()
+        self._metric_cache: MetricCache = MetricCache()
+        self._background_scheduler: BackgroundJobManager = BackgroundJobManager(
+            self._worker_pool, self._metric_cache
         )
-        self._background_scheduler: BackgroundJobManager = BackgroundJobManager()
         self._background_scheduler.start()
 
     def get_queue_length(self) -> int:
-        """Return queue length."""
-        return self._worker_pool.get_queue_length()
+        """Return the sampled queue length."""
+        return self._metric_cache.get_queue_sample()["queue_length"]
+
+    def get_dropped_tasks(self) -> int:
+        """Return the sampled number of tasks dropped at a full queue."""
+        return self._metric_cache.get_queue_sample()["dropped_tasks"]
+
+    def get_metric(self) -> Dict:
+        """Return the latest sampled metrics."""
+        system_sample = self._metric_cache.get_system_sample()
+        return {
+            **self._metric_cache.get_queue_sample(),
+            "cpu_percent": system_sample["cpu_percent"],
+            "rss_bytes": system_sample["rss_bytes"],
+        }
+
+    def get_metric_history(self) -> Dict[str, List[Dict]]:
+        """Return all cached samples."""
+        return self._metric_cache.get_history()
+
+    def put_tasks(self, batches: List[EncodedBatch]) -> None:
+        """Queue published tasks if the worker are running."""
+        if self._feeder is not None:
+            self._feeder.put(batches)
+        else:
+            self._worker_pool.put(batches)
 
     def get_worker_pool_status(self) -> str:
         """Return worker pool status."""
@@ -28,13 +88,18 @@ class Database(object):
 
     def start_worker(self) -> bool:
         """Start worker."""
-        return self._worker_pool.start()
+        with self._worker_lock:
+            return self._worker_pool.start()
 
     def close_worker(self) -> bool:
         """Close worker."""
-        return self._worker_pool.close()
+        with self._worker_lock:
+            return self._worker_pool.close()
 
     def close(self) -> None:
         """Close the database."""
-        self._worker_pool.terminate()
+        with self._worker_lock:
+            self._worker_pool.terminate()
+        if self._feeder is not None:
+            self._feeder.close()
         self._background_scheduler.close()
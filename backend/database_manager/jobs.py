@@ -0,0 +1,78 @@
+"""Calls of the database manager executed as background jobs.
+
+A job answers its request at once with a job id, while the call runs on a
+thread of its own. The status and the response of the call are kept for the
+most recent jobs, so clients can ask for them later.
+"""
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from itertools import count
+from threading import Lock
+from time import time
+from typing import Callable, Dict, Iterator, Optional
+
+from backend.request import Body
+from backend.response import Response, get_error_response
+
+# Number of jobs whose status is kept.
+MAX_JOBS = 1000
+
+
+class JobRegistry:
+    """Run calls as jobs and keep track of their status."""
+
+    def __init__(self, calls: Dict[str, Callable[[Body], Response]]) -> None:
+        """Initialize a JobRegistry with the calls that may run as jobs."""
+        self._calls: Dict[str, Callable[[Body], Response]] = calls
+        self._jobs: "OrderedDict[str, Dict]" = OrderedDict()
+        self._job_ids: Iterator[int] = count(1)
+        self._lock: Lock = Lock()
+        self._closed: bool = False
+        # A single thread, jobs change databases one after the other anyway.
+        self._executor: ThreadPoolExecutor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="job"
+        )
+
+    def submit(self, message: str, body: Body) -> Optional[Dict]:
+        """Start a job, return None if the call cannot run as a job."""
+        if message not in self._calls:
+            return None
+        job_id = str(next(self._job_ids))
+        job = {
+            "id": job_id,
+            "message": message,
+            "status": "pending",
+            "submitted": time(),
+            "finished": None,
+            "response": None,
+        }
+        with self._lock:
+            self._jobs[job_id] = job
+            while len(self._jobs) > MAX_JOBS:
+                self._jobs.popitem(last=False)
+        self._executor.submit(self._run, job, body)
+        return dict(job)
+
+    def _run(self, job: Dict, body: Body) -> None:
+        if self._closed:
+            job["status"] = "cancelled"
+            return
+        job["status"] = "running"
+        try:
+            response = self._calls[job["message"]](body)
+        except Exception as error:
+            response = get_error_response(500, str(error))
+        job["response"] = response
+        job["finished"] = time()
+        job["status"] = "done" if response["header"]["status"] < 400 else "failed"
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        """Return a copy of a job, None if it is unknown."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job) if job is not None else None
+
+    def close(self) -> None:
+        """Wait for the running job and cancel the pending ones."""
+        self._closed = True
+        self._executor.shutdown()
@@ -1,14 +1,38 @@
-"""Module for managing databases."""
+"""Module for managing databases.
 
-from time import sleep
+Operations on all databases run concurrently on a thread pool. They report the
+result of every database and give up waiting at a common deadline. A database
+whose operation outlived the deadline is locked until the operation finished.
+"""
+
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from logging import getLogger
+from threading import Lock
+from time import sleep, time
 from types import TracebackType
-from typing import Callable, Dict, Optional, Tuple, Type
+from typing import Callable, Dict, List, Optional, Set, Tuple, Type
 
 from backend.request import Body
-from backend.response import Response, get_response
+from backend.response import Response, get_error_response, get_response
 from backend.server import Server
 
 from .database import Database
+from .jobs import JobRegistry
+from .metric_publisher import MetricPublisher
+from .worker_pool.batch import EncodedBatch
+from .worker_pool.shared_pool import SharedWorkerPool
+from .workload_subscriber import WorkloadSubscriber
+
+logger = getLogger(__name__)
+
+
+def _get_result(future: Future, done: Set[Future]) -> str:
+    """Return the result of an operation on a database for the reply."""
+    if future not in done:
+        return "running"
+    if future.exception() is not None:
+        return "error"
+    return "ok" if future.result() else "failed"
 
 
 class DatabaseManager(object):
@@ -20,15 +44,82 @@ class DatabaseManager(object):
         db_manager_port: str,
         workload_sub_host: str,
         workload_pubsub_port: str,
+        number_workers: int = 1,
+        io_threads: int = 1,
+        number_processes: int = 0,
+        task_batch_size: int = 16,
+        task_queue_type: str = "queue",
+        reuse_processes: bool = False,
+        shared_pool_processes: int = 0,
+        task_queue_capacity: int = 0,
+        task_queue_policy: str = "drop_newest",
+        fan_out_timeout: int = 2000,
+        metric_pub_port: str = "8004",
+        metric_publish_interval: int = 0,
+        ring_buffer_task_size: int = 256,
     ) -> None:
-        """Initialize a DatabaseManager."""
-        self._workload_sub_host = workload_sub_host
-        self._workload_pubsub_port = workload_pubsub_port
-        self._databases: Dict[str, Database] = {}
+        """Initialize a DatabaseManager.
+
+        Operations on all databases wait at most fan_out_timeout milliseconds.
+        A slot of a ring buffer holds a batch of ring_buffer_task_size bytes
+        per task.
+        With a metric_publish_interval in milliseconds, snapshots of the
+        databases are published on the metric_pub_port.
+        """
+        # The server forks its processes, so it is created before the worker
+        # pools, threads and zmq contexts of the manager.
         server_calls: Dict[
             str, Tuple[Callable[[Body], Response], Optional[Dict]]
         ] = self._get_server_calls()
-        self._server = Server(db_manager_listening, db_manager_port, server_calls)
+        self._server = Server(
+            db_manager_listening,
+            db_manager_port,
+            server_calls,
+            io_threads=io_threads,
+            number_workers=number_workers,
+            number_processes=number_processes,
+            # Stateless call, safe to execute in any server process.
+            parallel_calls=frozenset(["get time intense metric"]),
+        )
+        self._task_queue_type = task_queue_type
+        self._reuse_processes = reuse_processes
+        self._task_queue_capacity = task_queue_capacity
+        self._task_queue_policy = task_queue_policy
+        self._slot_size = task_batch_size * ring_buffer_task_size
+        self._shared_pool: Optional[SharedWorkerPool] = (
+            SharedWorkerPool(
+                shared_pool_processes,
+                task_queue_type,
+                task_queue_capacity,
+                task_queue_policy,
+                self._slot_size,
+            )
+            if shared_pool_processes > 0
+            else None
+        )
+        self._databases: Dict[str, Database] = {}
+        self._databases_lock: Lock = Lock()
+        self._fan_out_timeout = fan_out_timeout
+        # Operations still running on databases after their deadline.
+        self._running: Dict[str, Future] = {}
+        self._executor: ThreadPoolExecutor = ThreadPoolExecutor(
+            thread_name_prefix="fan-out"
+        )
+        self._workload_subscriber = WorkloadSubscriber(
+            "tcp://{:s}:{:s}".format(workload_sub_host, workload_pubsub_port),
+            task_batch_size,
+            self._distribute_workload,
+        )
+        self._jobs: JobRegistry = JobRegistry(self._get_job_calls())
+        self._metric_publisher: Optional[MetricPublisher] = (
+            MetricPublisher(
+                "tcp://{:s}:{:s}".format(db_manager_listening, metric_pub_port),
+                metric_publish_interval,
+                self._get_snapshot,
+            )
+            if metric_publish_interval > 0
+            else None
+        )
 
     def __enter__(self) -> "DatabaseManager":
         """Return self for a context manager."""
@@ -44,19 +135,61 @@ class DatabaseManager(object):
         self.close()
         return None
 
+    def _synchronized(
+        self, call: Callable[[Body], Response]
+    ) -> Callable[[Body], Response]:
+        """Serialize calls touching the databases between server workers."""
+
+        def synchronized_call(body: Body) -> Response:
+            with self._databases_lock:
+                return call(body)
+
+        return synchronized_call
+
+    def _get_job_calls(self) -> Dict[str, Callable[[Body], Response]]:
+        """Return the slow calls, which may also run as jobs."""
+        return {
+            "add database": self._synchronized(self._call_add_database),
+            "delete database": self._synchronized(self._call_delete_database),
+            "start worker": self._synchronized(self._call_start_worker),
+            "close worker": self._synchronized(self._call_close_worker),
+            "get time intense metric": self._call_time_intense_metric,
+        }
+
     def _get_server_calls(self,) -> Dict:
+        # Reading calls iterate over a copy of the databases, so they neither
+        # wait for nor disturb the calls adding and removing databases.
         return {
-            "add database": self._call_add_database,
-            "delete database": self._call_delete_database,
-            "start worker": self._call_start_worker,
-            "close worker": self._call_close_worker,
+            **self._get_job_calls(),
             "get databases": self._call_get_databases,
             "get queue length": self._call_get_queue_length,
             "status": self._call_status,
-            "get time intense metric": self._call_time_intense_metric,
+            "get metrics": self._call_get_metrics,
             "get metric": self._call_metric,
+            "start job": self._call_start_job,
+            "get job status": self._call_get_job_status,
         }
 
+    def _get_databases(self) -> List[Tuple[str, Database]]:
+        return list(self._databases.items())
+
+    def _call_start_job(self, body: Body) -> Response:
+        """Run a call as a job and answer with the job at once."""
+        job = self._jobs.submit(body["message"], body.get("body", {}))
+        if job is None:
+            return get_response(400)
+        response = get_response(202)
+        response["body"]["job"] = job
+        return response
+
+    def _call_get_job_status(self, body: Body) -> Response:
+        job = self._jobs.get(body["id"])
+        if job is None:
+            return get_response(404)
+        response = get_response(200)
+        response["body"]["job"] = job
+        return response
+
     def _call_add_database(self, body: Body) -> Response:
         """Add database and initialize driver for it."""
         if body["id"] in self._databases:
@@ -65,27 +198,42 @@ class DatabaseManager(object):
         db_instance = Database(
             body["id"],
             body["number_workers"],
-            "tcp://{:s}:{:s}".format(
-                self._workload_sub_host, self._workload_pubsub_port,
-            ),
+            self._task_queue_type,
+            self._reuse_processes,
+            self._shared_pool,
+            self._task_queue_capacity,
+            self._task_queue_policy,
+            self._slot_size,
         )
         self._databases[body["id"]] = db_instance
+        self._workload_subscriber.subscribe(body["id"])
         return get_response(200)
 
     def _call_get_databases(self, body: Body) -> Response:
         """Get list of all databases."""
         databases = [
             {"id": id, "number_workers": database.number_workers}
-            for id, database in self._databases.items()
+            for id, database in self._get_databases()
         ]
         response = get_response(200)
         response["body"]["databases"] = databases
         return response
 
+    def _is_running(self, id: str) -> bool:
+        """Return whether an operation on a database outlived its deadline."""
+        future: Optional[Future] = self._running.get(id)
+        if future is not None and future.done():
+            del self._running[id]
+            return False
+        return future is not None
+
     def _call_delete_database(self, body: Body) -> Response:
         id: str = body["id"]
+        if self._is_running(id):
+            return get_error_response(423, "operation still running")
         database: Optional[Database] = self._databases.pop(id, None)
         if database:
+            self._workload_subscriber.unsubscribe(id)
             database.close()
             del database
             return get_response(200)
@@ -95,7 +243,7 @@ class DatabaseManager(object):
     def _call_status(self, body: Body) -> Response:
         status = []
 
-        for database_id, database in self._databases.items():
+        for database_id, database in self._get_databases():
             status.append(
                 {
                     "id": database_id,
@@ -106,26 +254,78 @@ class DatabaseManager(object):
         response["body"]["status"] = status
         return response
 
+    def _fan_out(self, operation: Callable[[Database], bool]) -> Response:
+        """Run an operation on all databases concurrently until the deadline.
+
+        Fails if the operation failed or did not finish for any database. The
+        operation is not started on databases still running an earlier one.
+        """
+        futures: Dict[str, Future] = {
+            id: self._running[id]
+            if self._is_running(id)
+            else self._executor.submit(operation, database)
+            for id, database in self._databases.items()
+        }
+        done, running = wait(futures.values(), timeout=self._fan_out_timeout / 1000)
+        self._running.update(
+            (id, future) for id, future in futures.items() if future in running
+        )
+        results = [
+            {"id": id, "result": _get_result(future, done)}
+            for id, future in futures.items()
+        ]
+        succeeded = all(result["result"] == "ok" for result in results)
+        response = get_response(200 if succeeded else 400)
+        response["body"]["databases"] = results
+        return response
+
     def _call_start_worker(self, body: Body) -> Response:
-        for database in self._databases.values():
-            if not database.start_worker():
-                return get_response(400)
-        return get_response(200)
+        return self._fan_out(Database.start_worker)
 
     def _call_close_worker(self, body: Body) -> Response:
-        for database in self._databases.values():
-            if not database.close_worker():
-                return get_response(400)
-        return get_response(200)
+        return self._fan_out(Database.close_worker)
 
     def _call_get_queue_length(self, body: Body) -> Response:
         response = get_response(200)
         response["body"]["databases"] = [
-            {"id": id, "queue_length": database.get_queue_length()}
-            for id, database in self._databases.items()
+            {
+                "id": id,
+                "queue_length": database.get_queue_length(),
+                "queue_capacity": self._task_queue_capacity,
+                "dropped_tasks": database.get_dropped_tasks(),
+            }
+            for id, database in self._get_databases()
         ]
         return response
 
+    def _call_get_metrics(self, body: Body) -> Response:
+        """Return the sampled metrics, with their history if requested."""
+        databases = []
+        for id, database in self._get_databases():
+            metric = {"id": id, **database.get_metric()}
+            if body.get("history"):
+                metric["history"] = database.get_metric_history()
+            databases.append(metric)
+        response = get_response(200)
+        response["body"]["databases"] = databases
+        return response
+
+    def _get_snapshot(self) -> Body:
+        """Return the status and the latest metrics of all databases."""
+        return {
+            "timestamp": time(),
+            "databases": [
+                {
+                    "id": id,
+                    "number_workers": database.number_workers,
+                    "worker_pool_status": database.get_worker_pool_status(),
+                    "queue_capacity": self._task_queue_capacity,
+                    **database.get_metric(),
+                }
+                for id, database in self._get_databases()
+            ],
+        }
+
     def _call_time_intense_metric(self, body: Body) -> Response:
         # do some work
         sleep(0.2)
@@ -133,17 +333,44 @@ class DatabaseManager(object):
         return response
 
     def _call_metric(self, body: Body) -> Response:
-        # do some work
-        sleep(0.05)
-        response = get_response(200)
-        return response
+        """Return the latest sampled metrics of all databases."""
+        return self._call_get_metrics({})
+
+    def _distribute_workload(
+        self, database_id: Optional[str], batches: List[EncodedBatch]
+    ) -> None:
+        """Hand the batches of a published workload to its databases.
+
+        A failing database must not stop the delivery to the others.
+        """
+        if database_id is None:
+            databases = self._get_databases()
+        else:
+            database = self._databases.get(database_id)
+            databases = [(database_id, database)] if database is not None else []
+        for id, database in databases:
+            try:
+                database.put_tasks(batches)
+            except Exception:
+                logger.exception("Failed to queue tasks of database %s.", id)
 
     def start(self) -> None:
-        """Start the manager by starting the server."""
+        """Start the manager by starting the subscriber and the server."""
+        self._workload_subscriber.start()
+        if self._metric_publisher is not None:
+            self._metric_publisher.start()
         self._server.start()
 
     def close(self) -> None:
         """Close the socket and context, exit all databases."""
-        for database in self._databases.values():
-            database.close()
+        self._workload_subscriber.close()
+        if self._metric_publisher is not None:
+            self._metric_publisher.close()
+        self._jobs.close()
+        wait(self._running.values())
+        # Waits for all databases, there is nothing left to answer in time.
+        list(self._executor.map(Database.close, self._databases.values()))
+        self._executor.shutdown()
+        if self._shared_pool is not None:
+            self._shared_pool.close()
         self._server.close()
@@ -0,0 +1,69 @@
+"""In-memory cache of the sampled metrics of a database.
+
+Background jobs add samples to ring buffers of fixed length, so requests read
+the latest sample or the recent history without touching the task queue or the
+worker processes.
+"""
+from collections import deque
+from threading import Lock
+from typing import Deque, Dict, List
+
+EMPTY_QUEUE_SAMPLE: Dict = {
+    "timestamp": 0.0,
+    "queue_length": 0,
+    "dropped_tasks": 0,
+    "taken_tasks": 0,
+    "throughput": 0.0,
+}
+EMPTY_SYSTEM_SAMPLE: Dict = {
+    "timestamp": 0.0,
+    "cpu_seconds": 0.0,
+    "cpu_percent": 0.0,
+    "rss_bytes": 0,
+}
+
+
+class MetricCache:
+    """Latest queue and system samples of a database."""
+
+    def __init__(self, queue_samples: int = 600, system_samples: int = 60) -> None:
+        """Initialize empty ring buffers holding at most the given samples."""
+        self._queue_samples: Deque[Dict] = deque(maxlen=queue_samples)
+        self._system_samples: Deque[Dict] = deque(maxlen=system_samples)
+        # Guards copying the history against concurrent samples.
+        self._lock: Lock = Lock()
+
+    def add_queue_sample(self, sample: Dict) -> None:
+        """Add a sample of the task queue."""
+        with self._lock:
+            self._queue_samples.append(sample)
+
+    def add_system_sample(self, sample: Dict) -> None:
+        """Add a sample of the worker processes."""
+        with self._lock:
+            self._system_samples.append(sample)
+
+    def get_queue_sample(self, age: int = 0) -> Dict:
+        """Return the queue sample taken age samples before the latest one.
+
+        Returns the oldest sample if there are fewer samples.
+        """
+        with self._lock:
+            if not self._queue_samples:
+                return EMPTY_QUEUE_SAMPLE
+            return self._queue_samples[-1 - min(age, len(self._queue_samples) - 1)]
+
+    def get_system_sample(self) -> Dict:
+        """Return the latest system sample."""
+        with self._lock:
+            if not self._system_samples:
+                return EMPTY_SYSTEM_SAMPLE
+            return self._system_samples[-1]
+
+    def get_history(self) -> Dict[str, List[Dict]]:
+        """Return all cached samples, oldest first."""
+        with self._lock:
+            return {
+                "queue": list(self._queue_samples),
+                "system": list(self._system_samples),
+            }
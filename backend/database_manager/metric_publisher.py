@@ -0,0 +1,50 @@
+"""Publisher of metric snapshots of the databases.
+
+Every interval the manager publishes the status, queue length and sampled
+metrics of all its databases. Subscribers keep the latest snapshot, so they
+answer without asking the manager and are at most one interval behind.
+"""
+from threading import Event, Thread
+from typing import Callable
+
+from zmq import LINGER, PUB, Context
+
+from backend.codec import encode
+from backend.request import Body, Header, Request
+
+
+class MetricPublisher:
+    """Thread publishing a snapshot of the databases every interval."""
+
+    def __init__(
+        self, publisher_url: str, interval: int, get_snapshot: Callable[[], Body]
+    ) -> None:
+        """Initialize a MetricPublisher with an interval in milliseconds."""
+        self._publisher_url: str = publisher_url
+        self._interval: int = interval
+        self._get_snapshot: Callable[[], Body] = get_snapshot
+        self._closed: Event = Event()
+        self._thread: Thread = Thread(target=self._publish, daemon=True)
+
+    def _publish(self) -> None:
+        pub_socket = Context.instance().socket(PUB)
+        pub_socket.setsockopt(LINGER, 0)
+        pub_socket.bind(self._publisher_url)
+        try:
+            while not self._closed.wait(self._interval / 1000):
+                snapshot = Request(
+                    header=Header(message="metric snapshot"), body=self._get_snapshot()
+                )
+                pub_socket.send(encode(snapshot))
+        finally:
+            pub_socket.close()
+
+    def start(self) -> None:
+        """Start publishing snapshots."""
+        self._thread.start()
+
+    def close(self) -> None:
+        """Stop publishing snapshots."""
+        self._closed.set()
+        if self._thread.is_alive():
+            self._thread.join()
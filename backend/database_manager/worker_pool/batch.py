@@ -0,0 +1,58 @@
+"""Batches of tasks as they are passed to the worker processes.
+
+Tasks are run-length encoded as [query, count] pairs, both in the published
+workloads and in the batches, so their size grows with the number of distinct
+queries rather than with the number of tasks.
+"""
+from typing import Iterator, List, Tuple
+
+from backend.codec import decode, encode
+
+# Number of tasks and the tasks encoded with the IPC codec.
+EncodedBatch = Tuple[int, bytes]
+# A query and the number of times it is executed.
+Run = List
+
+
+def split_into_batches(runs: List[Run], batch_size: int) -> List[List[Run]]:
+    """Split runs into batches of at most batch_size tasks."""
+    batches: List[List[Run]] = []
+    batch: List[Run] = []
+    free = batch_size
+    for query, count in runs:
+        while count > 0:
+            taken = min(count, free)
+            batch.append([query, taken])
+            count -= taken
+            free -= taken
+            if not free:
+                batches.append(batch)
+                batch, free = [], batch_size
+    if batch:
+        batches.append(batch)
+    return batches
+
+
+def count_tasks(batch: List[Run]) -> int:
+    """Return the number of tasks of runs."""
+    return sum(count for _, count in batch)
+
+
+def encode_batches(runs: List[Run], batch_size: int) -> List[EncodedBatch]:
+    """Split runs into batches and encode each of them once."""
+    return [
+        (count_tasks(batch), encode(batch))
+        for batch in split_into_batches(runs, batch_size)
+    ]
+
+
+def decode_batch(payload: bytes) -> List[Run]:
+    """Return the runs of an encoded batch."""
+    return decode(payload)
+
+
+def expand_batch(batch: List[Run]) -> Iterator[str]:
+    """Yield the query of every task of a batch."""
+    for query, count in batch:
+        for _ in range(count):
+            yield query
@@ -2,11 +2,30 @@
 from multiprocessing import Queue, Value
 from multiprocessing.synchronize import Event as EventType
 from queue import Empty
+from signal import SIG_IGN, SIGINT, signal
 from time import sleep
 
+from .batch import count_tasks, decode_batch, expand_batch
+
+# Seconds a worker blocks on an empty queue before it checks the flag again.
+TASK_QUEUE_TIMEOUT = 0.1
+
+
+def discard_tasks(task_queue: Queue, task_count: Value) -> None:
+    """Remove the tasks left in the queue."""
+    while True:
+        try:
+            batch = decode_batch(task_queue.get(block=False))
+        except Empty:
+            return
+        with task_count.get_lock():
+            task_count.value -= count_tasks(batch)
+
 
 def execute_worker(
     task_queue: Queue,
+    task_count: Value,
+    taken_count: Value,
     continue_execution_flag: Value,
     i_am_done_event: EventType,
     worker_wait_for_exit_event: EventType,
@@ -14,10 +33,26 @@ def execute_worker(
     """Define workers work loop."""
     while True:
         if not continue_execution_flag.value:
+            discard_tasks(task_queue, task_count)
             i_am_done_event.set()
             worker_wait_for_exit_event.wait()
         try:
-            _ = task_queue.get(block=False)
-            sleep(0.001)
+            batch = decode_batch(task_queue.get(timeout=TASK_QUEUE_TIMEOUT))
         except Empty:
             continue
+        size = count_tasks(batch)
+        with task_count.get_lock():
+            task_count.value -= size
+        with taken_count.get_lock():
+            taken_count.value += size
+        for _ in expand_batch(batch):
+            sleep(0.001)
+
+
+def execute_shared_worker(task_queue: Queue) -> None:
+    """Execute the batches of all databases dispatched to a shared pool."""
+    signal(SIGINT, SIG_IGN)
+    while True:
+        batch = decode_batch(task_queue.get())
+        for _ in expand_batch(batch):
+            sleep(0.001)
@@ -0,0 +1,72 @@
+"""Thread feeding the tasks of one database into its blocking worker pool.
+
+With the block policy a full task queue blocks the caller until the workers
+made space. The workload subscriber delivers the tasks of all databases, so
+every database hands its tasks to its own feeder and only that feeder blocks.
+The backlog of a feeder holds at most the queue capacity, tasks beyond it are
+dropped and counted like those of a full queue.
+"""
+from collections import deque
+from logging import getLogger
+from threading import Condition, Thread
+from typing import Deque, List, Optional, Union
+
+from .batch import EncodedBatch
+from .pool import WorkerPool, is_full
+from .shared_pool import PoolShare
+
+logger = getLogger(__name__)
+
+
+class TaskFeeder:
+    """Backlog of batches put into a worker pool by a thread."""
+
+    def __init__(self, worker_pool: Union[WorkerPool, PoolShare], backlog: int) -> None:
+        """Start a TaskFeeder holding at most backlog tasks."""
+        self._worker_pool: Union[WorkerPool, PoolShare] = worker_pool
+        self._backlog: int = backlog
+        self._batches: Deque[EncodedBatch] = deque()
+        self._task_count: int = 0
+        self._condition: Condition = Condition()
+        self._closed: bool = False
+        self._thread: Thread = Thread(target=self._feed, daemon=True)
+        self._thread.start()
+
+    def put(self, batches: List[EncodedBatch]) -> None:
+        """Add batches to the backlog without blocking."""
+        with self._condition:
+            for size, payload in batches:
+                if is_full(self._task_count, size, self._backlog):
+                    self._worker_pool.add_dropped_tasks(size)
+                    continue
+                self._batches.append((size, payload))
+                self._task_count += size
+            self._condition.notify()
+
+    def _next_batch(self) -> Optional[EncodedBatch]:
+        with self._condition:
+            while not self._batches and not self._closed:
+                self._condition.wait()
+            return None if self._closed else self._batches[0]
+
+    def _feed(self) -> None:
+        while True:
+            batch = self._next_batch()
+            if batch is None:
+                return
+            try:
+                # Blocks while the queue of the running workers is full.
+                self._worker_pool.put([batch])
+            except Exception:
+                logger.exception("Dropped a batch the worker pool refused.")
+                self._worker_pool.add_dropped_tasks(batch[0])
+            with self._condition:
+                self._batches.popleft()
+                self._task_count -= batch[0]
+
+    def close(self) -> None:
+        """Drop the backlog and stop the thread once the pool stopped blocking."""
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+        self._thread.join()
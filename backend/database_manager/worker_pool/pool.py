@@ -1,31 +1,99 @@
 """The WorkerPool object represents the workers."""
 from multiprocessing import Event, Process, Value
 from multiprocessing.synchronize import Event as EventType
-from typing import List, Optional
+from queue import Empty, Full
+from threading import Lock
+from time import sleep
+from typing import List, Union
 
 from backend.cross_platform_support.multiprocessing_support import Queue
 
-from .enqueue_worker import enqueue_worker
-from .execute_worker import execute_worker
+from .batch import EncodedBatch, count_tasks, decode_batch
+from .execute_worker import TASK_QUEUE_TIMEOUT, execute_worker
+from .ring_buffer import RingBufferQueue
+
+TaskQueue = Union[Queue, RingBufferQueue]
+
+# What happens to a batch arriving at a full queue.
+QUEUE_POLICIES = ("drop_newest", "drop_oldest", "block")
+# Slots of a ring buffer of an unbounded queue, more batches are dropped.
+UNBOUNDED_RING_BUFFER_SLOTS = 1024
+
+
+def is_full(queued: int, size: int, capacity: int) -> bool:
+    """Check if a batch exceeds the capacity, 0 is unbounded.
+
+    A batch always fits into an empty queue, even if it exceeds the capacity.
+    """
+    return capacity > 0 and queued > 0 and queued + size > capacity
+
+
+def create_task_queue(
+    task_queue_type: str, capacity: int = 0, slot_size: int = 4096
+) -> TaskQueue:
+    """Create a task queue, a capacity of 0 means unbounded if possible.
+
+    The capacity counts items, a ring buffer holds items of up to slot_size
+    bytes.
+    """
+    if task_queue_type == "ring_buffer":
+        return RingBufferQueue(capacity or UNBOUNDED_RING_BUFFER_SLOTS, slot_size)
+    return Queue(capacity)
+
+
+def close_task_queue(task_queue: TaskQueue) -> None:
+    """Close a task queue whose consumers are gone.
+
+    Tasks still buffered are dropped, waiting for them would block the exit.
+    """
+    task_queue.cancel_join_thread()
+    task_queue.close()
 
 
 class WorkerPool:
     """Represents WorkerPool."""
 
     def __init__(
-        self, number_worker: int, database_id: str, workload_publisher_url: str,
+        self,
+        number_worker: int,
+        database_id: str,
+        task_queue_type: str = "queue",
+        reuse_processes: bool = False,
+        queue_capacity: int = 0,
+        queue_policy: str = "drop_newest",
+        slot_size: int = 4096,
     ) -> None:
-        """Initialize WorkerPool object."""
+        """Initialize WorkerPool object, the queue capacity counts tasks.
+
+        A ring buffer gets a slot of slot_size bytes per task of the capacity,
+        every batch holds at least one task.
+        """
         self._number_worker: int = number_worker
         self._database_id: str = database_id
-        self._workload_publisher_url: str = workload_publisher_url
+        self._task_queue_type: str = task_queue_type
+        self._reuse_processes: bool = reuse_processes
+        self._queue_capacity: int = queue_capacity
+        self._queue_policy: str = queue_policy
+        self._slot_size: int = slot_size
+        self._dropped_tasks: int = 0
         self._status: str = "closed"
         self._continue_execution_flag: Value = Value("b", True)
         self._execute_workers: List[Process] = []
         self._execute_task_worker_done_event: List[EventType] = []
-        self._enqueue_worker: Optional[Process] = None
         self._worker_wait_for_exit_event: EventType = Event()
-        self._task_queue: Queue = Queue(0)
+        self._task_queue: TaskQueue = self._create_task_queue()
+        # The queue holds batches, so the number of tasks is counted separately.
+        self._task_count: Value = Value("i", 0)
+        # Tasks taken by the workers, including those of terminated workers.
+        self._taken_count: Value = Value("Q", 0)
+        self._terminated_taken_tasks: int = 0
+        # Guards status and task queue against the workload subscriber.
+        self._queue_lock: Lock = Lock()
+
+    def _create_task_queue(self) -> TaskQueue:
+        return create_task_queue(
+            self._task_queue_type, self._queue_capacity, self._slot_size
+        )
 
     def _generate_execute_worker_done_events(self) -> List[EventType]:
         return [Event() for _ in range(self._number_worker)]
@@ -36,6 +104,8 @@ class WorkerPool:
                 target=execute_worker,
                 args=(
                     self._task_queue,
+                    self._task_count,
+                    self._taken_count,
                     self._continue_execution_flag,
                     self._execute_task_worker_done_event[i],
                     self._worker_wait_for_exit_event,
@@ -44,32 +114,23 @@ class WorkerPool:
             for i in range(self._number_worker)
         ]
 
-    def _generate_enqueue_worker(self) -> Process:
-        return Process(
-            target=enqueue_worker,
-            args=(
-                self._workload_publisher_url,
-                self._task_queue,
-                self._continue_execution_flag,
-                self._worker_wait_for_exit_event,
-            ),
-        )
-
     def _init_workers(self) -> None:
         self._execute_task_worker_done_event = (
             self._generate_execute_worker_done_events()
         )
         self._execute_workers = self._generate_execute_worker()
-        self._enqueue_worker = self._generate_enqueue_worker()
 
     def _terminate_worker(self) -> None:
-        self._enqueue_worker.terminate()  # type: ignore
-        self._enqueue_worker = None
         for i in range(self._number_worker):
             self._execute_workers[i].terminate()
         self._execute_workers = []
         self._worker_wait_for_exit_event = Event()
-        self._task_queue = Queue(0)
+        close_task_queue(self._task_queue)
+        self._task_queue = self._create_task_queue()
+        self._task_count = Value("i", 0)
+        # A terminated worker may have held the lock of the old counter.
+        self._terminated_taken_tasks += self._taken_count.value
+        self._taken_count = Value("Q", 0)
 
     def _wait_for_worker(self) -> None:
         self._worker_wait_for_exit_event.clear()
@@ -79,21 +140,35 @@ class WorkerPool:
 
     def _start_worker(self) -> None:
         self._continue_execution_flag.value = True
-        self._enqueue_worker.start()  # type: ignore
         for i in range(self._number_worker):
             self._execute_workers[i].start()
 
+    def _resume_worker(self) -> None:
+        for i in range(self._number_worker):
+            self._execute_task_worker_done_event[i].clear()
+        self._continue_execution_flag.value = True
+        self._worker_wait_for_exit_event.set()
+
+    def _set_status(self, status: str) -> None:
+        with self._queue_lock:
+            self._status = status
+
     def _start_job(self) -> None:
         if self._status == "closed":
-            self._worker_wait_for_exit_event.set()
-            self._init_workers()
-            self._start_worker()
-            self._status = "running"
+            if self._execute_workers:
+                self._resume_worker()
+            else:
+                self._worker_wait_for_exit_event.set()
+                self._init_workers()
+                self._start_worker()
+            self._set_status("running")
 
     def _close_job(self) -> None:
         if self._status == "running":
+            self._set_status("closed")
             self._wait_for_worker()
-            self._terminate_worker()
+            if not self._reuse_processes:
+                self._terminate_worker()
         self._status = "closed"
 
     def start(self) -> bool:
@@ -107,14 +182,64 @@ class WorkerPool:
         return True
 
     def terminate(self) -> bool:
-        """Terminates worker."""
-        if self._status == "running":
+        """Terminates worker, including paused ones."""
+        was_running = self._status == "running"
+        self._set_status("closed")
+        if self._execute_workers:
             self._terminate_worker()
-            self._task_queue.close()
-            self._status = "closed"
-            return True
-        else:
-            return False
+        close_task_queue(self._task_queue)
+        return was_running
+
+    def _is_full(self, size: int) -> bool:
+        return is_full(self._task_count.value, size, self._queue_capacity)
+
+    def _wait_for_space(self, size: int) -> None:
+        """Block while the queue of running workers is full."""
+        while self._status == "running" and self._is_full(size):
+            sleep(TASK_QUEUE_TIMEOUT / 10)
+
+    def _drop_oldest(self, size: int) -> None:
+        """Drop the oldest batches until the new batch fits."""
+        while self._is_full(size):
+            try:
+                batch = decode_batch(self._task_queue.get(block=False))
+            except Empty:
+                # Taken by the workers or not yet flushed into the pipe.
+                return
+            dropped = count_tasks(batch)
+            with self._task_count.get_lock():
+                self._task_count.value -= dropped
+            self._dropped_tasks += dropped
+
+    def _enqueue(self, size: int, payload: bytes) -> None:
+        if self._queue_policy == "drop_oldest":
+            self._drop_oldest(size)
+        if self._is_full(size):
+            self._dropped_tasks += size
+            return
+        with self._task_count.get_lock():
+            self._task_count.value += size
+        try:
+            self._task_queue.put(payload, block=False)
+        # A batch larger than a slot of a ring buffer is dropped as well.
+        except (Full, ValueError):
+            with self._task_count.get_lock():
+                self._task_count.value -= size
+            self._dropped_tasks += size
+
+    def put(self, batches: List[EncodedBatch]) -> None:
+        """Queue batches of tasks while the workers are running.
+
+        A full queue drops the new or the oldest tasks, or blocks the caller
+        until the workers made space, depending on the queue policy.
+        """
+        for size, payload in batches:
+            if self._queue_policy == "block":
+                self._wait_for_space(size)
+            with self._queue_lock:
+                if self._status != "running":
+                    return
+                self._enqueue(size, payload)
 
     def get_status(self) -> str:
         """Return status of pool."""
@@ -122,4 +247,25 @@ class WorkerPool:
 
     def get_queue_length(self) -> int:
         """Return queue length."""
-        return self._task_queue.qsize()
+        return self._task_count.value
+
+    def get_taken_tasks(self) -> int:
+        """Return the number of tasks the workers took from the queue."""
+        return self._terminated_taken_tasks + self._taken_count.value
+
+    def get_worker_pids(self) -> List[int]:
+        """Return the process ids of the running workers."""
+        return [
+            worker.pid
+            for worker in self._execute_workers
+            if worker.pid is not None and worker.is_alive()
+        ]
+
+    def get_dropped_tasks(self) -> int:
+        """Return the number of tasks dropped at a full queue."""
+        return self._dropped_tasks
+
+    def add_dropped_tasks(self, count: int) -> None:
+        """Count tasks dropped before they reached the queue."""
+        with self._queue_lock:
+            self._dropped_tasks += count
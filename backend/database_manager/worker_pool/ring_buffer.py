@@ -0,0 +1,114 @@
+"""Task queue backed by a ring buffer in shared memory.
+
+A single producer writes byte strings into fixed-size slots of a shared
+memory block and many consumers read them. Two semaphores count the free and
+the filled slots, so consumers only share a lock to advance the read index and
+the producer never takes a lock at all.
+"""
+from multiprocessing import Lock, Semaphore
+from multiprocessing.shared_memory import SharedMemory
+from os import getpid
+from queue import Empty, Full
+from struct import Struct
+from typing import Dict, Optional
+
+_INDEX = Struct("Q")
+_LENGTH = Struct("I")
+# Read and write index live on separate cache lines.
+_HEAD_OFFSET = 0
+_TAIL_OFFSET = 64
+_HEADER_SIZE = 128
+
+
+class RingBufferQueue:
+    """Fixed-capacity queue with one producer and many consumers.
+
+    Items are byte strings and must fit into one slot.
+    """
+
+    def __init__(self, capacity: int, slot_size: int) -> None:
+        """Initialize capacity slots of slot_size bytes and their semaphores."""
+        self._capacity: int = capacity
+        self._slot_size: int = slot_size
+        self._memory: SharedMemory = SharedMemory(
+            create=True, size=_HEADER_SIZE + capacity * slot_size
+        )
+        self._buffer: memoryview = self._memory.buf  # type: ignore
+        self._buffer[:_HEADER_SIZE] = bytes(_HEADER_SIZE)
+        self._free_slots = Semaphore(capacity)
+        self._filled_slots = Semaphore(0)
+        self._read_lock = Lock()
+        self._owner_pid: Optional[int] = getpid()
+
+    def __getstate__(self) -> Dict:
+        """Leave out the memoryview, which spawned processes cannot receive."""
+        state = self.__dict__.copy()
+        del state["_buffer"]
+        return state
+
+    def __setstate__(self, state: Dict) -> None:
+        """Attach to the shared memory again."""
+        self.__dict__.update(state)
+        self._buffer = self._memory.buf  # type: ignore
+
+    def _get_index(self, offset: int) -> int:
+        return _INDEX.unpack_from(self._buffer, offset)[0]
+
+    def _set_index(self, offset: int, value: int) -> None:
+        _INDEX.pack_into(self._buffer, offset, value)
+
+    def _get_slot_offset(self, index: int) -> int:
+        return _HEADER_SIZE + (index % self._capacity) * self._slot_size
+
+    def put(
+        self, data: bytes, block: bool = True, timeout: Optional[float] = None
+    ) -> None:
+        """Put data into the queue, only one process may put.
+
+        Raises ValueError if the data does not fit into a slot.
+        """
+        if _LENGTH.size + len(data) > self._slot_size:
+            raise ValueError(
+                f"Item of {len(data)} bytes exceeds slot size {self._slot_size}."
+            )
+        if not self._free_slots.acquire(block, timeout):
+            raise Full
+        tail = self._get_index(_TAIL_OFFSET)
+        offset = self._get_slot_offset(tail)
+        _LENGTH.pack_into(self._buffer, offset, len(data))
+        start = offset + _LENGTH.size
+        self._buffer[start : start + len(data)] = data
+        self._set_index(_TAIL_OFFSET, tail + 1)
+        self._filled_slots.release()
+
+    def get(self, block: bool = True, timeout: Optional[float] = None) -> bytes:
+        """Remove and return data from the queue."""
+        if not self._filled_slots.acquire(block, timeout):
+            raise Empty
+        with self._read_lock:
+            head = self._get_index(_HEAD_OFFSET)
+            offset = self._get_slot_offset(head)
+            (length,) = _LENGTH.unpack_from(self._buffer, offset)
+            start = offset + _LENGTH.size
+            data = bytes(self._buffer[start : start + length])
+            self._set_index(_HEAD_OFFSET, head + 1)
+        self._free_slots.release()
+        return data
+
+    def qsize(self) -> int:
+        """Return the exact number of items in the queue."""
+        return self._get_index(_TAIL_OFFSET) - self._get_index(_HEAD_OFFSET)
+
+    def empty(self) -> bool:
+        """Return True if the queue holds no items."""
+        return not self.qsize()
+
+    def cancel_join_thread(self) -> None:
+        """Do nothing, a put is written directly without a feeder thread."""
+
+    def close(self) -> None:
+        """Close the shared memory, the creating process also removes it."""
+        self._memory.close()
+        if getpid() == self._owner_pid:
+            self._memory.unlink()
+            self._owner_pid = None
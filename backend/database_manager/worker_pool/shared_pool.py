@@ -0,0 +1,279 @@
+"""Worker processes shared by all databases of a manager.
+
+Every database keeps its tasks in its own queue inside the manager process. A
+dispatcher thread moves one batch at a time into the bounded task queue of the
+shared processes. It always picks the database with the lowest virtual time,
+which grows by the size of each dispatched batch divided by the weight of the
+database, so databases share the processes in proportion to their weights.
+The capacity and policy of the queue of a database work as in a WorkerPool.
+"""
+from collections import deque
+from multiprocessing import Process
+from threading import Condition, Thread
+from typing import Deque, Dict, List, Optional, Tuple
+
+from .batch import EncodedBatch
+from .execute_worker import TASK_QUEUE_TIMEOUT, execute_shared_worker
+from .pool import close_task_queue, create_task_queue, is_full
+
+
+class DatabaseQueue:
+    """Tasks of one database waiting for the shared pool."""
+
+    def __init__(self, weight: int) -> None:
+        """Initialize an empty DatabaseQueue."""
+        self.weight: int = weight
+        self.batches: Deque[EncodedBatch] = deque()
+        self.task_count: int = 0
+        self.virtual_time: float = 0.0
+        self.running: bool = False
+        self.dropped_tasks: int = 0
+        self.taken_tasks: int = 0
+
+
+class SharedWorkerPool:
+    """Pool of execute processes serving the queues of all databases."""
+
+    def __init__(
+        self,
+        number_processes: int,
+        task_queue_type: str = "queue",
+        queue_capacity: int = 0,
+        queue_policy: str = "drop_newest",
+        slot_size: int = 4096,
+    ) -> None:
+        """Start the processes and the dispatcher."""
+        self._number_processes: int = number_processes
+        self._queue_capacity: int = queue_capacity
+        self._queue_policy: str = queue_policy
+        # Bounded, so scheduling decisions are made shortly before execution.
+        self._task_queue = create_task_queue(
+            task_queue_type, number_processes, slot_size
+        )
+        self._queues: Dict[str, DatabaseQueue] = {}
+        # Dispatched batches that may still wait in the task queue.
+        self._dispatched: Deque[Tuple[DatabaseQueue, int]] = deque()
+        self._virtual_time: float = 0.0
+        self._condition: Condition = Condition()
+        self._running: bool = True
+        self._processes: List[Process] = [
+            Process(target=execute_shared_worker, args=(self._task_queue,), daemon=True)
+            for _ in range(number_processes)
+        ]
+        for process in self._processes:
+            process.start()
+        self._dispatcher: Thread = Thread(target=self._dispatch, daemon=True)
+        self._dispatcher.start()
+
+    def add(self, database_id: str, weight: int) -> None:
+        """Add the queue of a database."""
+        with self._condition:
+            self._queues[database_id] = DatabaseQueue(max(weight, 1))
+
+    def remove(self, database_id: str) -> None:
+        """Remove the queue of a database and its tasks."""
+        with self._condition:
+            queue = self._queues.pop(database_id, None)
+            if queue is not None:
+                queue.running = False
+
+    def start(self, database_id: str) -> None:
+        """Accept tasks of a database."""
+        with self._condition:
+            queue = self._queues.get(database_id)
+            if queue is not None:
+                queue.running = True
+
+    def stop(self, database_id: str) -> None:
+        """Refuse tasks of a database and drop those not dispatched yet."""
+        with self._condition:
+            queue = self._queues.get(database_id)
+            if queue is not None:
+                queue.running = False
+                queue.task_count -= sum(size for size, _ in queue.batches)
+                queue.batches.clear()
+
+    def put(self, database_id: str, batches: List[EncodedBatch]) -> None:
+        """Queue batches of tasks of a running database."""
+        with self._condition:
+            queue = self._queues.get(database_id)
+            if queue is None or not queue.running or not batches:
+                return
+            if not queue.batches:
+                # An idle database must not catch up on the time it was idle.
+                queue.virtual_time = max(queue.virtual_time, self._virtual_time)
+            for size, payload in batches:
+                if self._make_space(queue, size):
+                    queue.batches.append((size, payload))
+                    queue.task_count += size
+            self._condition.notify()
+
+    def _is_full(self, queue: DatabaseQueue, size: int) -> bool:
+        return is_full(queue.task_count, size, self._queue_capacity)
+
+    def _make_space(self, queue: DatabaseQueue, size: int) -> bool:
+        """Apply the queue policy, return False if the batch is dropped."""
+        if self._queue_policy == "block":
+            while queue.running and self._is_full(queue, size):
+                self._condition.wait(TASK_QUEUE_TIMEOUT / 10)
+                self._count_taken_batches()
+            if not queue.running:
+                return False
+        elif self._queue_policy == "drop_oldest":
+            while self._is_full(queue, size) and queue.batches:
+                dropped, _ = queue.batches.popleft()
+                queue.task_count -= dropped
+                queue.dropped_tasks += dropped
+        if self._is_full(queue, size):
+            queue.dropped_tasks += size
+            return False
+        return True
+
+    def get_queue_length(self, database_id: str) -> int:
+        """Return the number of tasks of a database not taken by a process."""
+        with self._condition:
+            self._count_taken_batches()
+            queue = self._queues.get(database_id)
+            return queue.task_count if queue is not None else 0
+
+    def get_taken_tasks(self, database_id: str) -> int:
+        """Return the number of tasks of a database taken by a process."""
+        with self._condition:
+            self._count_taken_batches()
+            queue = self._queues.get(database_id)
+            return queue.taken_tasks if queue is not None else 0
+
+    def get_dropped_tasks(self, database_id: str) -> int:
+        """Return the number of tasks of a database dropped at a full queue."""
+        with self._condition:
+            queue = self._queues.get(database_id)
+            return queue.dropped_tasks if queue is not None else 0
+
+    def add_dropped_tasks(self, database_id: str, count: int) -> None:
+        """Count tasks of a database dropped before they reached its queue."""
+        with self._condition:
+            queue = self._queues.get(database_id)
+            if queue is not None:
+                queue.dropped_tasks += count
+
+    def _count_taken_batches(self) -> None:
+        """Forget dispatched batches that were taken from the task queue.
+
+        The task queue is FIFO, so all but the newest qsize batches are taken.
+        """
+        while len(self._dispatched) > self._task_queue.qsize():
+            queue, size = self._dispatched.popleft()
+            queue.task_count -= size
+            queue.taken_tasks += size
+
+    def _next_queue(self) -> Optional[DatabaseQueue]:
+        waiting = [queue for queue in self._queues.values() if queue.batches]
+        if not waiting:
+            return None
+        return min(waiting, key=lambda queue: queue.virtual_time)
+
+    def _take_batch(self) -> Optional[Tuple[DatabaseQueue, EncodedBatch]]:
+        with self._condition:
+            queue = self._next_queue()
+            while queue is None and self._running:
+                self._condition.wait()
+                queue = self._next_queue()
+            if queue is None:
+                return None
+            batch = queue.batches.popleft()
+            self._virtual_time = queue.virtual_time
+            queue.virtual_time += batch[0] / queue.weight
+            return queue, batch
+
+    def _dispatch(self) -> None:
+        while True:
+            taken = self._take_batch()
+            if taken is None:
+                return
+            queue, (size, payload) = taken
+            try:
+                # Blocks while the processes are busy with earlier batches.
+                self._task_queue.put(payload)
+            except ValueError:
+                # Larger than a slot of the ring buffer.
+                with self._condition:
+                    queue.task_count -= size
+                    queue.dropped_tasks += size
+                continue
+            with self._condition:
+                self._dispatched.append((queue, size))
+                self._count_taken_batches()
+
+    def close(self) -> None:
+        """Stop the dispatcher and terminate the processes."""
+        with self._condition:
+            self._running = False
+            self._queues.clear()
+            self._condition.notify()
+        for process in self._processes:
+            process.terminate()
+        self._dispatcher.join(timeout=1)
+        close_task_queue(self._task_queue)
+
+
+class PoolShare:
+    """Workers of one database running in a SharedWorkerPool.
+
+    Offers the interface of a WorkerPool, its weight is the number of workers.
+    """
+
+    def __init__(
+        self, shared_pool: SharedWorkerPool, database_id: str, weight: int,
+    ) -> None:
+        """Initialize a PoolShare and add its queue to the pool."""
+        self._shared_pool: SharedWorkerPool = shared_pool
+        self._database_id: str = database_id
+        self._status: str = "closed"
+        self._shared_pool.add(database_id, weight)
+
+    def start(self) -> bool:
+        """Start worker."""
+        self._shared_pool.start(self._database_id)
+        self._status = "running"
+        return True
+
+    def close(self) -> bool:
+        """Close worker."""
+        self._shared_pool.stop(self._database_id)
+        self._status = "closed"
+        return True
+
+    def terminate(self) -> bool:
+        """Terminates worker and removes the queue from the pool."""
+        was_running = self._status == "running"
+        self._status = "closed"
+        self._shared_pool.remove(self._database_id)
+        return was_running
+
+    def put(self, batches: List[EncodedBatch]) -> None:
+        """Queue batches of tasks while the workers are running."""
+        self._shared_pool.put(self._database_id, batches)
+
+    def get_status(self) -> str:
+        """Return status of pool."""
+        return self._status
+
+    def get_queue_length(self) -> int:
+        """Return queue length."""
+        return self._shared_pool.get_queue_length(self._database_id)
+
+    def get_dropped_tasks(self) -> int:
+        """Return the number of tasks dropped at a full queue."""
+        return self._shared_pool.get_dropped_tasks(self._database_id)
+
+    def add_dropped_tasks(self, count: int) -> None:
+        """Count tasks dropped before they reached the queue."""
+        self._shared_pool.add_dropped_tasks(self._database_id, count)
+
+    def get_taken_tasks(self) -> int:
+        """Return the number of tasks the shared processes took from the queue."""
+        return self._shared_pool.get_taken_tasks(self._database_id)
+
+    def get_worker_pids(self) -> List[int]:
+        """Return no process ids, the shared processes serve all databases."""
+        return []
@@ -0,0 +1,107 @@
+"""Subscriber receiving the published workloads for all databases.
+
+The subscriber listens to the broadcast topic and to the topic of every
+database of the manager, so zmq filters out workloads for other databases.
+Each published workload is decoded and split into encoded batches once. The
+same batches are handed to every database it targets, so the work of the
+subscriber does not grow with the number of databases. A database only copies
+the bytes into its task queue, or not even that when it runs in the shared pool.
+A malformed message is logged and skipped, the subscriber goes on.
+"""
+from logging import getLogger
+from queue import Empty, SimpleQueue
+from threading import Event, Thread
+from typing import Callable, Dict, List, Optional, Tuple
+
+from zmq import SUB, SUBSCRIBE, UNSUBSCRIBE, Context, Socket
+
+from backend.codec import decode
+from backend.topic import BROADCAST_TOPIC, get_database_id, get_topic
+
+from .worker_pool.batch import EncodedBatch, encode_batches
+
+logger = getLogger(__name__)
+
+# Milliseconds the subscriber waits for workloads before it checks for closing.
+SUBSCRIBER_TIMEOUT = 100
+
+
+class WorkloadSubscriber:
+    """Thread distributing the published workloads to the databases."""
+
+    def __init__(
+        self,
+        workload_publisher_url: str,
+        task_batch_size: int,
+        distribute: Callable[[Optional[str], List[EncodedBatch]], None],
+    ) -> None:
+        """Initialize a WorkloadSubscriber."""
+        self._workload_publisher_url: str = workload_publisher_url
+        self._task_batch_size: int = task_batch_size
+        self._distribute: Callable[
+            [Optional[str], List[EncodedBatch]], None
+        ] = distribute
+        # Changes of the subscriptions, applied by the thread owning the socket.
+        self._subscription_changes: SimpleQueue = SimpleQueue()
+        self._last_payload: bytes = b""
+        self._last_batches: List[EncodedBatch] = []
+        self._closed: Event = Event()
+        self._thread: Thread = Thread(target=self._receive, daemon=True)
+
+    def subscribe(self, database_id: str) -> None:
+        """Receive the workloads published for a database."""
+        self._subscription_changes.put((SUBSCRIBE, get_topic(database_id)))
+
+    def unsubscribe(self, database_id: str) -> None:
+        """Stop receiving the workloads published for a database."""
+        self._subscription_changes.put((UNSUBSCRIBE, get_topic(database_id)))
+
+    def _apply_subscription_changes(self, sub_socket: Socket) -> None:
+        while True:
+            try:
+                change: Tuple[int, bytes] = self._subscription_changes.get_nowait()
+            except Empty:
+                return
+            sub_socket.setsockopt(*change)
+
+    def _get_batches(self, payload: bytes) -> List[EncodedBatch]:
+        """Decode a payload, unless it equals the previous one."""
+        if payload != self._last_payload:
+            published_data: Dict = decode(payload)
+            runs = published_data["body"]["queries"]
+            self._last_batches = encode_batches(runs, self._task_batch_size)
+            self._last_payload = payload
+        return self._last_batches
+
+    def _handle(self, frames: List[bytes]) -> None:
+        """Distribute the workload of a message, skip it if it is malformed."""
+        try:
+            topic, payload = frames
+            database_id = get_database_id(topic)
+            batches = self._get_batches(payload)
+        except Exception:
+            logger.exception("Skipped a malformed workload message.")
+            return
+        self._distribute(database_id, batches)
+
+    def _receive(self) -> None:
+        sub_socket = Context.instance().socket(SUB)
+        sub_socket.connect(self._workload_publisher_url)
+        sub_socket.setsockopt(SUBSCRIBE, BROADCAST_TOPIC)
+        try:
+            while not self._closed.is_set():
+                self._apply_subscription_changes(sub_socket)
+                if sub_socket.poll(SUBSCRIBER_TIMEOUT):
+                    self._handle(sub_socket.recv_multipart())
+        finally:
+            sub_socket.close()
+
+    def start(self) -> None:
+        """Start receiving workloads."""
+        self._thread.start()
+
+    def close(self) -> None:
+        """Stop receiving workloads."""
+        self._closed.set()
+        if self._thread.is_alive():
+            self._thread.join()
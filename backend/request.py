@@ -5,12 +5,22 @@ from typing import Any, Dict, TypedDict
 Body = Dict[str, Any]
 
 
-class Header(TypedDict):
-    """Header Type."""
+class HeaderBase(TypedDict):
+    """Minimal Header Type."""
 
     message: str
 
 
+class Header(HeaderBase, total=False):
+    """Header Type.
+
+    The optional id correlates a reply with its request when several requests
+    are in flight on the same connection.
+    """
+
+    id: int
+
+
 class Request(TypedDict):
     """Minimal Response Type."""
 
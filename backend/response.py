@@ -5,13 +5,22 @@ from typing import Any, Dict, TypedDict
 Body = Dict[str, Any]
 
 
-class Header(TypedDict):
-    """Header Type."""
+class HeaderBase(TypedDict):
+    """Minimal Header Type."""
 
     status: int
     message: str
 
 
+class Header(HeaderBase, total=False):
+    """Header Type.
+
+    The optional id repeats the id of the answered request.
+    """
+
+    id: int
+
+
 class ResponseBase(TypedDict):
     """Minimal Response Type."""
 
@@ -26,6 +35,7 @@ class Response(ResponseBase, total=False):
 
 _responses: Dict[int, str] = {
     200: "OK",
+    202: "ACCEPTED",
     400: "BAD REQUEST",
     404: "NOT FOUND",
     409: "CONFLICT",
@@ -1,46 +1,203 @@
 """Server module handling zmq requests.
 
 Used by Database Manager and Workload Generator.
+
+With a single worker the server answers requests on a REP socket. With more
+workers it runs as a broker: a ROUTER frontend forwards requests over an inproc
+DEALER backend to a pool of worker threads, each serving its own REP socket.
+
+With worker processes the broker forwards the calls listed as parallel over
+ipc to the processes. All other calls are handled by a single owner thread in
+the server process, so state changed by those calls lives in one place only.
 """
 
-from typing import Dict
+from multiprocessing import Process
+from signal import SIG_BLOCK, SIG_IGN, SIGINT, pthread_sigmask, signal
+from tempfile import gettempdir
+from threading import Thread
+from typing import Dict, FrozenSet, List
 
-from zmq import REP, Context
+from zmq import (
+    DEALER,
+    POLLIN,
+    REP,
+    ROUTER,
+    Context,
+    ContextTerminated,
+    Poller,
+    Socket,
+    proxy,
+)
 
+from backend.codec import decode, encode
 from backend.request import Request
-from backend.response import Response, get_response
+from backend.response import Header, Response, get_response
+
+WORKER_URL = "inproc://workers"
+OWNER_URL = "inproc://owner"
+
+
+def _handle_request(calls: Dict, request: Request) -> Response:
+    try:
+        func = calls[request["header"]["message"]]
+        return func(request["body"])
+    except KeyError:
+        return get_response(404)
+
+
+def _correlate(request: Request, response: Response) -> Response:
+    """Repeat the request id in the reply without touching the original response."""
+    if "id" not in request["header"]:
+        return response
+    header = Header(**response["header"])
+    header["id"] = request["header"]["id"]
+    return Response(header=header, body=response.get("body", {}))
+
+
+def _serve(socket: Socket, calls: Dict) -> None:
+    while True:
+        request: Request = decode(socket.recv())
+        response: Response = _handle_request(calls, request)
+        socket.send(encode(_correlate(request, response)))
+
+
+def _serve_process(url: str, calls: Dict) -> None:
+    """Serve forwarded requests in a worker process."""
+    signal(SIGINT, SIG_IGN)
+    context = Context()
+    socket = context.socket(REP)
+    socket.connect(url)
+    _serve(socket, calls)
 
 
 class Server:
     """Server component handling zmq requests."""
 
-    def __init__(self, host: str, port: str, calls: Dict, io_threads: int = 1,) -> None:
-        """Initialize a Server with a host, port and calls."""
+    def __init__(
+        self,
+        host: str,
+        port: str,
+        calls: Dict,
+        io_threads: int = 1,
+        number_workers: int = 1,
+        number_processes: int = 0,
+        parallel_calls: FrozenSet[str] = frozenset(),
+    ) -> None:
+        """Initialize a Server with a host, port and calls.
+
+        The server processes are forked here, so a Server is created before
+        its owner starts threads or opens zmq contexts.
+        """
         self._calls = calls
         self._host = host
         self._port = port
+        self._number_workers = number_workers
+        self._number_processes = number_processes
+        self._parallel_calls = parallel_calls
+        self._workers: List[Thread] = []
+        self._processes: List[Process] = []
+        self._init_processes()
         self._init_server(io_threads)
 
+    def _uses_processes(self) -> bool:
+        return self._number_processes > 0
+
+    def _uses_threads(self) -> bool:
+        return self._number_workers > 1
+
+    def _init_processes(self) -> None:
+        """Fork the worker processes before the server creates its context and threads."""
+        self._process_url = "ipc://{:s}/server-{:s}".format(gettempdir(), self._port)
+        self._processes = [
+            Process(
+                target=_serve_process,
+                args=(self._process_url, self._calls),
+                daemon=True,
+            )
+            for _ in range(self._number_processes)
+        ]
+        for process in self._processes:
+            process.start()
+
     def _init_server(self, io_threads: int) -> None:
         self._context = Context(io_threads=io_threads)
-        self._socket = self._context.socket(REP)
+        self._backends: List[Socket] = []
+        if self._uses_processes():
+            self._socket = self._context.socket(ROUTER)
+            self._owner_backend = self._bind_backend(OWNER_URL)
+            self._process_backend = self._bind_backend(self._process_url)
+        elif self._uses_threads():
+            self._socket = self._context.socket(ROUTER)
+            self._worker_backend = self._bind_backend(WORKER_URL)
+        else:
+            self._socket = self._context.socket(REP)
         self._socket.bind("tcp://{:s}:{:s}".format(self._host, self._port))
 
+    def _bind_backend(self, url: str) -> Socket:
+        backend = self._context.socket(DEALER)
+        backend.bind(url)
+        self._backends.append(backend)
+        return backend
+
     def start(self) -> None:
         """Start the server loop."""
-        while True:
-            request: Request = self._socket.recv_json()
-            response: Response = self._handle_request(request)
-            self._socket.send_json(response)
+        if self._uses_processes():
+            self._start_process_broker()
+        elif self._uses_threads():
+            self._start_thread_broker()
+        else:
+            _serve(self._socket, self._calls)
 
-    def _handle_request(self, request: Request) -> Response:
+    def _start_workers(self, number_workers: int, url: str) -> None:
+        self._workers = [
+            Thread(target=self._run_worker, args=(url,), daemon=True)
+            for _ in range(number_workers)
+        ]
+        for worker in self._workers:
+            worker.start()
+
+    def _run_worker(self, url: str) -> None:
+        # Keep SIGINT on the main thread, which is blocked in zmq and would
+        # not notice a signal handled by another thread.
+        pthread_sigmask(SIG_BLOCK, [SIGINT])
+        socket = self._context.socket(REP)
+        socket.connect(url)
         try:
-            func = self._calls[request["header"]["message"]]
-            return func(request["body"])
-        except KeyError:
-            return get_response(404)
+            _serve(socket, self._calls)
+        except ContextTerminated:
+            socket.close()
+
+    def _start_thread_broker(self) -> None:
+        self._start_workers(self._number_workers, WORKER_URL)
+        proxy(self._socket, self._worker_backend)
+
+    def _start_process_broker(self) -> None:
+        self._start_workers(1, OWNER_URL)
+        poller = Poller()
+        poller.register(self._socket, POLLIN)
+        for backend in self._backends:
+            poller.register(backend, POLLIN)
+        while True:
+            events = dict(poller.poll())
+            if self._socket in events:
+                self._route_request(self._socket.recv_multipart())
+            for backend in self._backends:
+                if backend in events:
+                    self._socket.send_multipart(backend.recv_multipart())
+
+    def _route_request(self, frames: List[bytes]) -> None:
+        """Forward parallel calls to the processes and all others to the owner."""
+        request: Request = decode(frames[-1])
+        if request["header"]["message"] in self._parallel_calls:
+            self._process_backend.send_multipart(frames)
+        else:
+            self._owner_backend.send_multipart(frames)
 
     def close(self) -> None:
         """Close the socket and terminate it."""
         self._socket.close()
+        for backend in self._backends:
+            backend.close()
         self._context.term()
+        for process in self._processes:
+            process.terminate()
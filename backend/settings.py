@@ -23,6 +23,22 @@ BACKEND_LISTENING: str = getenv("BACKEND_LISTENING", "0.0.0.0")
 DB_MANAGER_HOST: str = getenv("DB_MANAGER_HOST", "manager")
 DB_MANAGER_PORT: str = getenv("DB_MANAGER_PORT", "8001")
 DB_MANAGER_LISTENING: str = getenv("DB_MANAGER_LISTENING", "*")
+DB_MANAGER_WORKERS: int = int(getenv("DB_MANAGER_WORKERS", 1))
+DB_MANAGER_IO_THREADS: int = int(getenv("DB_MANAGER_IO_THREADS", 1))
+DB_MANAGER_PROCESSES: int = int(getenv("DB_MANAGER_PROCESSES", 0))
+TASK_BATCH_SIZE: int = int(getenv("TASK_BATCH_SIZE", 16))
+TASK_QUEUE_TYPE: str = getenv("TASK_QUEUE_TYPE", "queue")
+REUSE_WORKER_PROCESSES: bool = bool(getenv("REUSE_WORKER_PROCESSES", False))
+SHARED_POOL_PROCESSES: int = int(getenv("SHARED_POOL_PROCESSES", 0))
+TASK_QUEUE_CAPACITY: int = int(getenv("TASK_QUEUE_CAPACITY", 0))
+TASK_QUEUE_POLICY: str = getenv("TASK_QUEUE_POLICY", "drop_newest")
+RING_BUFFER_TASK_SIZE: int = int(getenv("RING_BUFFER_TASK_SIZE", 256))
+DB_MANAGER_FAN_OUT_TIMEOUT: int = int(getenv("DB_MANAGER_FAN_OUT_TIMEOUT", 2000))
+DB_MANAGER_METRIC_PORT: str = getenv("DB_MANAGER_METRIC_PORT", "8004")
+METRIC_PUBLISH_INTERVAL: int = int(getenv("METRIC_PUBLISH_INTERVAL", 0))
+
+BROKER_LISTENING: str = getenv("BROKER_LISTENING", "127.0.0.1")
+BROKER_PORT: str = getenv("BROKER_PORT", DB_MANAGER_PORT)
 
 GENERATOR_HOST: str = getenv("GENERATOR_HOST", "generator")
 GENERATOR_PORT: str = getenv("GENERATOR_PORT", "8002")
@@ -31,6 +47,18 @@ GENERATOR_LISTENING: str = getenv("GENERATOR_LISTENING", "*")
 WORKLOAD_SUB_HOST: str = getenv("WORKLOAD_SUB_HOST", "generator")
 WORKLOAD_PUBSUB_PORT: str = getenv("WORKLOAD_PUBSUB_PORT", "8003")
 WORKLOAD_LISTENING: str = getenv("WORKLOAD_LISTENING", "*")
+WORKLOAD_TICK: int = int(getenv("WORKLOAD_TICK", 100))
+WORKLOAD_TRACE_DIRECTORY: str = getenv("WORKLOAD_TRACE_DIRECTORY", "traces")
+WORKLOAD_THROTTLE_INTERVAL: int = int(getenv("WORKLOAD_THROTTLE_INTERVAL", 0))
+
+IPC_REQUEST_TIMEOUT: int = int(getenv("IPC_REQUEST_TIMEOUT", 2500))
+IPC_REQUEST_RETRIES: int = int(getenv("IPC_REQUEST_RETRIES", 2))
+IPC_CODEC: str = getenv("IPC_CODEC", "json")
+IPC_MULTIPLEXING: bool = bool(getenv("IPC_MULTIPLEXING", False))
+
+METRIC_CACHE_TTL: int = int(getenv("METRIC_CACHE_TTL", 0))
+METRIC_CACHE_STALE: int = int(getenv("METRIC_CACHE_STALE", 0))
+METRIC_STREAM_INTERVAL: int = int(getenv("METRIC_STREAM_INTERVAL", 1000))
 
 DEFAULT_TABLES: str = getenv("DEFAULT_TABLES", "tpch_0_1")
 
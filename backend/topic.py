@@ -0,0 +1,22 @@
+"""Topics of the workloads published by the Workload Generator.
+
+Every message starts with a topic frame, so subscribers filter the databases
+they host inside zmq. A topic ends with a null byte, which keeps a database id
+from matching the topics of longer ids sharing its prefix.
+"""
+from typing import Optional
+
+# Topic of workloads for all databases.
+BROADCAST_TOPIC = b"\0"
+
+
+def get_topic(database_id: str) -> bytes:
+    """Return the topic of the workloads for a database."""
+    return database_id.encode() + b"\0"
+
+
+def get_database_id(topic: bytes) -> Optional[str]:
+    """Return the database of a topic, None for all databases."""
+    if topic == BROADCAST_TOPIC:
+        return None
+    return topic[:-1].decode()
@@ -1,9 +1,14 @@
 """CLI used to start the workload generator."""
 from backend.settings import (
+    DB_MANAGER_HOST,
+    DB_MANAGER_PORT,
     GENERATOR_LISTENING,
     GENERATOR_PORT,
     WORKLOAD_LISTENING,
     WORKLOAD_PUBSUB_PORT,
+    WORKLOAD_THROTTLE_INTERVAL,
+    WORKLOAD_TICK,
+    WORKLOAD_TRACE_DIRECTORY,
 )
 
 from .generator import WorkloadGenerator
@@ -17,6 +22,10 @@ def main() -> None:
             GENERATOR_PORT,
             WORKLOAD_LISTENING,
             WORKLOAD_PUBSUB_PORT,
+            WORKLOAD_TICK,
+            WORKLOAD_TRACE_DIRECTORY,
+            f"tcp://{DB_MANAGER_HOST}:{DB_MANAGER_PORT}",
+            WORKLOAD_THROTTLE_INTERVAL,
         ) as workload_generator:
             print(
                 f"Workload generator running on port {GENERATOR_PORT} (Press CTRL+C to quit)"
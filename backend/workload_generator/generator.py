@@ -1,17 +1,32 @@
 """Module for generating workloads.
 
-Includes the main WorkloadGenerator.
+Includes the main WorkloadGenerator. It runs any number of named workloads at
+once. Every tick it sends a single message per topic with the queries of all
+workloads sent to that topic, and encodes each distinct mix of workloads once.
+The queries of a workload are paced over the ticks by its arrival process, or
+replayed from a recorded trace. An optional throttle slows down the workloads
+of databases whose task queues fill up. A workload whose pacer fails is
+stopped, the other workloads go on.
 """
 
+from logging import getLogger
+from threading import Lock
 from types import TracebackType
-from typing import Dict, Optional, Type
+from typing import Dict, List, Optional, Tuple, Type
 
-from apscheduler.schedulers.background import BackgroundScheduler
 from zmq import PUB, Context
 
+from backend.codec import encode
 from backend.request import Body
 from backend.response import Response, get_response
 from backend.server import Server
+from backend.topic import BROADCAST_TOPIC, get_topic
+
+from .pacing import Pacer, Queries, Ticker, get_pacer
+from .throttle import Throttle
+from .trace import TracePacer, get_trace_path
+
+logger = getLogger(__name__)
 
 
 class WorkloadGenerator(object):
@@ -23,27 +38,36 @@ class WorkloadGenerator(object):
         generator_port: str,
         workload_listening: str,
         workload_pub_port: str,
+        tick: int = 100,
+        trace_directory: str = "traces",
+        manager_url: Optional[str] = None,
+        throttle_interval: int = 0,
     ) -> None:
-        """Initialize a WorkloadGenerator."""
+        """Initialize a WorkloadGenerator with a tick in milliseconds.
+
+        With a throttle interval in milliseconds, the queues of the manager are
+        checked at that interval to throttle the workloads.
+        """
         self._workload_listening = workload_listening
         self._workload_pub_port = workload_pub_port
+        self._trace_directory = trace_directory
         server_calls: Dict = {
             "start workload": self._call_start_workload,
             "get workload": self._call_get_workload,
             "stop workload": self._call_stop_workload,
         }
         self._server = Server(generator_listening, generator_port, server_calls)
-        self._workload: str = None  # type: ignore
-        self._workload_frequency: int = 0
+        self._workloads: Dict[str, Body] = {}
+        self._pacers: Dict[str, Pacer] = {}
+        # Guards the workloads and pacers shared with the ticker thread.
+        self._lock: Lock = Lock()
         self._init_server()
-        self._init_scheduler()
-
-    def _init_scheduler(self) -> None:
-        self._scheduler = BackgroundScheduler()
-        self._generate_workload_job = self._scheduler.add_job(
-            func=self._generate_workload, trigger="interval", seconds=1,
-        )
-        self._scheduler.start()
+        self._throttle: Optional[Throttle] = None
+        if manager_url is not None and throttle_interval > 0:
+            self._throttle = Throttle(manager_url, throttle_interval)
+            self._throttle.start()
+        self._ticker = Ticker(tick / 1000, self._generate_workload)
+        self._ticker.start()
 
     def __enter__(self) -> "WorkloadGenerator":
         """Return self for a context manager."""
@@ -66,30 +90,106 @@ class WorkloadGenerator(object):
             "tcp://{:s}:{:s}".format(self._workload_listening, self._workload_pub_port)
         )
 
+    def _create_pacer(self, body: Body) -> Pacer:
+        if body.get("trace"):
+            path = get_trace_path(self._trace_directory, body["trace"])
+            return TracePacer(path, body.get("speed", 1.0), body.get("loop", False))
+        return get_pacer(
+            body.get("arrivals", "uniform"), body["workload_name"], body["frequency"]
+        )
+
     def _call_start_workload(self, body: Body) -> Response:
-        self._workload = body["workload_name"]
-        self._workload_frequency = body["frequency"]
+        """Start a workload, or update the running workload of that name."""
+        try:
+            pacer = self._create_pacer(body)
+        except (KeyError, OSError, ValueError):
+            return get_response(400)
+        name = body["workload_name"]
+        with self._lock:
+            if name in self._pacers:
+                self._pacers[name].close()
+            self._pacers[name] = pacer
+            self._workloads[name] = {
+                "workload_name": name,
+                "frequency": body.get("frequency", 0),
+                "databases": body.get("databases", []),
+                "arrivals": body.get("arrivals", "uniform"),
+                "trace": body.get("trace"),
+                "speed": body.get("speed", 1.0),
+                "loop": body.get("loop", False),
+            }
         return get_response(200)
 
     def _call_stop_workload(self, body: Body) -> Response:
-        self._workload = None  # type: ignore
-        self._workload_frequency = 0
+        """Stop the workload of a name, or all workloads without a name."""
+        with self._lock:
+            if "workload_name" not in body:
+                names = list(self._workloads)
+            elif body["workload_name"] in self._workloads:
+                names = [body["workload_name"]]
+            else:
+                return get_response(404)
+            for name in names:
+                self._remove_workload(name)
         return get_response(200)
 
-    def _generate_workload(self) -> None:
-        if self._workload:
-            response = get_response(200)
-            response["body"]["querylist"] = [
-                self._workload for _ in range(self._workload_frequency)
-            ]
-            self._pub_socket.send_json(response)
+    def _remove_workload(self, name: str) -> None:
+        del self._workloads[name]
+        self._pacers.pop(name).close()
+
+    def _get_due(self, name: str, pacer: Pacer, elapsed: float) -> Queries:
+        """Return the queries due of a workload, stop it if its pacer fails."""
+        databases = self._workloads[name]["databases"]
+        try:
+            return pacer.get_due(elapsed * self._get_rate_factor(databases))
+        except Exception:
+            logger.exception("Stopped workload %s, its pacer failed.", name)
+            self._remove_workload(name)
+            return []
+
+    def _get_due_queries(self, elapsed: float) -> Dict[bytes, Queries]:
+        """Collect the queries due with each topic."""
+        queries_by_topic: Dict[bytes, Queries] = {}
+        with self._lock:
+            for name, pacer in list(self._pacers.items()):
+                due = self._get_due(name, pacer, elapsed)
+                if not due:
+                    continue
+                topics = [get_topic(id) for id in self._workloads[name]["databases"]]
+                for topic in topics or [BROADCAST_TOPIC]:
+                    queries_by_topic.setdefault(topic, []).extend(due)
+        return queries_by_topic
+
+    def _get_rate_factor(self, databases: List[str]) -> float:
+        if self._throttle is None:
+            return 1.0
+        return self._throttle.get_factor(databases)
+
+    def _encode_queries(self, queries: Queries) -> bytes:
+        response = get_response(200)
+        # Each query is sent once with the number of times it is due.
+        response["body"]["queries"] = [[name, due] for name, due in queries]
+        return encode(response)
+
+    def _generate_workload(self, elapsed: float) -> None:
+        payloads: Dict[Tuple[Tuple[str, int], ...], bytes] = {}
+        for topic, queries in self._get_due_queries(elapsed).items():
+            mix = tuple(queries)
+            if mix not in payloads:
+                payloads[mix] = self._encode_queries(queries)
+            self._pub_socket.send_multipart([topic, payloads[mix]], copy=False)
 
     def _call_get_workload(self, body: Body) -> Response:
+        """Return the workload of a name, or all workloads without a name."""
+        with self._lock:
+            if "workload_name" not in body:
+                workloads = list(self._workloads.values())
+            elif body["workload_name"] in self._workloads:
+                workloads = [self._workloads[body["workload_name"]]]
+            else:
+                return get_response(404)
         response = get_response(200)
-        response["body"]["workload"] = {
-            "workload_name": self._workload,
-            "frequency": self._workload_frequency,
-        }
+        response["body"]["workloads"] = workloads
         return response
 
     def start(self) -> None:
@@ -98,7 +198,10 @@ class WorkloadGenerator(object):
 
     def close(self) -> None:
         """Close the socket and context."""
-        self._generate_workload_job.remove()
-        self._scheduler.shutdown()
+        self._ticker.close()
+        if self._throttle is not None:
+            self._throttle.close()
+        for pacer in self._pacers.values():
+            pacer.close()
         self._pub_socket.close()
         self._context.term()
@@ -0,0 +1,139 @@
+"""Pacing of generated workloads.
+
+A Ticker calls back at a fixed tick with the time that actually elapsed since
+the last call. Pacers turn that time into the queries due, so late ticks send
+more queries instead of losing them and the rate stays exact over time
+regardless of scheduler drift.
+"""
+from abc import ABC, abstractmethod
+from logging import getLogger
+from random import expovariate
+from threading import Event, Thread
+from time import monotonic
+from typing import Callable, Dict, List, Tuple, Type
+
+logger = getLogger(__name__)
+
+# Queries and the number of times each of them is due.
+Queries = List[Tuple[str, int]]
+
+
+class Pacer(ABC):
+    """Queries of a workload due over time."""
+
+    @abstractmethod
+    def get_due(self, elapsed: float) -> Queries:
+        """Return the queries due after elapsed seconds."""
+
+    def close(self) -> None:
+        """Release the resources of the pacer."""
+
+
+class RatePacer(Pacer):
+    """Single query sent at a number of queries per second."""
+
+    def __init__(self, query: str, frequency: int) -> None:
+        """Initialize a RatePacer with queries per second."""
+        self._query: str = query
+        self._frequency: int = frequency
+
+    @abstractmethod
+    def _count(self, elapsed: float) -> int:
+        """Return the number of queries due after elapsed seconds."""
+
+    def get_due(self, elapsed: float) -> Queries:
+        """Return the queries due after elapsed seconds."""
+        due = self._count(elapsed)
+        return [(self._query, due)] if due else []
+
+
+class UniformPacer(RatePacer):
+    """Spread queries evenly, carrying fractions over to the next tick."""
+
+    def __init__(self, query: str, frequency: int) -> None:
+        """Initialize a UniformPacer."""
+        super().__init__(query, frequency)
+        self._credit: float = 0.0
+
+    def _count(self, elapsed: float) -> int:
+        self._credit += self._frequency * elapsed
+        due = int(self._credit)
+        self._credit -= due
+        return due
+
+
+class PoissonPacer(RatePacer):
+    """Send queries as a Poisson process with exponential inter-arrival times."""
+
+    def __init__(self, query: str, frequency: int) -> None:
+        """Initialize a PoissonPacer."""
+        super().__init__(query, frequency)
+        self._until_arrival: float = self._draw()
+
+    def _draw(self) -> float:
+        return expovariate(self._frequency) if self._frequency > 0 else float("inf")
+
+    def _count(self, elapsed: float) -> int:
+        due = 0
+        while self._until_arrival <= elapsed:
+            elapsed -= self._until_arrival
+            self._until_arrival = self._draw()
+            due += 1
+        self._until_arrival -= elapsed
+        return due
+
+
+_PACERS: Dict[str, Type[RatePacer]] = {
+    "uniform": UniformPacer,
+    "poisson": PoissonPacer,
+}
+
+ARRIVAL_PROCESSES = tuple(_PACERS)
+
+
+def get_pacer(arrivals: str, query: str, frequency: int) -> Pacer:
+    """Return a pacer for the arrival process of a workload."""
+    if arrivals not in _PACERS:
+        raise ValueError(
+            f"Unknown arrival process {arrivals}, choose one of {ARRIVAL_PROCESSES}"
+        )
+    return _PACERS[arrivals](query, frequency)
+
+
+class Ticker:
+    """Thread calling back every tick with the elapsed seconds."""
+
+    def __init__(self, tick: float, callback: Callable[[float], None]) -> None:
+        """Initialize a Ticker with a tick in seconds."""
+        self._tick: float = tick
+        self._callback: Callable[[float], None] = callback
+        self._stopped: Event = Event()
+        self._thread: Thread = Thread(target=self._run, daemon=True)
+
+    def _run(self) -> None:
+        last = deadline = monotonic()
+        while True:
+            # Deadlines are absolute, so time spent in callbacks does not add up.
+            deadline += self._tick
+            delay = deadline - monotonic()
+            if delay < 0:
+                # Behind schedule, the next call covers the missed time at once.
+                deadline, delay = monotonic(), 0
+            if self._stopped.wait(delay):
+                return
+            now = monotonic()
+            try:
+                self._callback(now - last)
+            except Exception:
+                # A failing tick must not stop the ticks to come.
+                logger.exception("Tick failed.")
+            last = now
+
+    def start(self) -> None:
+        """Start calling back."""
+        self._thread.start()
+
+    def close(self) -> None:
+        """Stop calling back."""
+        self._stopped.set()
+        self._thread.join()
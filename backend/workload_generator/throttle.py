@@ -0,0 +1,83 @@
+"""Throttle of the workload generator by the queues of the database manager.
+
+A thread asks the manager for the queue length of every database. Workloads run
+at full rate while the queues of their databases are at most half full and
+slow down linearly to a stop at a full queue. The pacers see less elapsed time,
+so throttled queries are not generated at all and a trace replay slows down.
+"""
+from threading import Event, Thread
+from typing import Dict, List
+
+from zmq import LINGER, POLLIN, REQ, Context, Socket
+
+from backend.codec import decode, encode
+from backend.request import Header, Request
+from backend.response import Response
+
+# Share of the queue capacity up to which workloads run at full rate.
+FULL_RATE_FILL = 0.5
+
+
+def get_rate_factor(queue_length: int, queue_capacity: int) -> float:
+    """Return the share of the rate at which a queue is filled."""
+    if queue_capacity <= 0:
+        return 1.0
+    fill = queue_length / queue_capacity
+    return min(1.0, max(0.0, (1 - fill) / (1 - FULL_RATE_FILL)))
+
+
+class Throttle:
+    """Rate factors of the databases, updated every interval."""
+
+    def __init__(self, manager_url: str, interval: int) -> None:
+        """Initialize a Throttle with an interval in milliseconds."""
+        self._manager_url: str = manager_url
+        self._interval: int = interval
+        self._factors: Dict[str, float] = {}
+        self._stopped: Event = Event()
+        self._thread: Thread = Thread(target=self._run, daemon=True)
+
+    def _connect(self) -> Socket:
+        socket: Socket = Context.instance().socket(REQ)
+        socket.setsockopt(LINGER, 0)
+        socket.connect(self._manager_url)
+        return socket
+
+    def _update(self, response: Response) -> None:
+        self._factors = {
+            database["id"]: get_rate_factor(
+                database["queue_length"], database["queue_capacity"]
+            )
+            for database in response["body"]["databases"]
+        }
+
+    def _run(self) -> None:
+        socket = self._connect()
+        request = Request(header=Header(message="get queue length"), body={})
+        while not self._stopped.wait(self._interval / 1000):
+            socket.send(encode(request))
+            if socket.poll(self._interval, POLLIN):
+                self._update(decode(socket.recv()))
+            else:
+                # Never stall the workloads while the manager is unreachable.
+                self._factors = {}
+                socket.close()
+                socket = self._connect()
+        socket.close()
+
+    def get_factor(self, database_ids: List[str]) -> float:
+        """Return the rate factor of the slowest database, all if none given."""
+        factors = self._factors
+        selected = [factors[id] for id in database_ids if id in factors]
+        if not database_ids:
+            selected = list(factors.values())
+        return min(selected, default=1.0)
+
+    def start(self) -> None:
+        """Start updating the rate factors."""
+        self._thread.start()
+
+    def close(self) -> None:
+        """Stop updating the rate factors."""
+        self._stopped.set()
+        self._thread.join()
@@ -0,0 +1,89 @@
+"""Replay of recorded workload traces.
+
+A trace is a JSON-lines file with one query per line, ordered by the time in
+seconds it was recorded at, for example {"timestamp": 12.5, "query": "q1"}. The
+file is read line by line while it is replayed, so only a small buffer of the
+trace is held in memory regardless of its size.
+"""
+from json import loads
+from os.path import commonpath, join, realpath
+from typing import IO, Dict, Optional, Tuple
+
+from .pacing import Pacer, Queries
+
+# Time of a query relative to the start of the replay and the query.
+Record = Tuple[float, str]
+
+
+def get_trace_path(directory: str, name: str) -> str:
+    """Return the path of a trace, which has to be inside the directory."""
+    directory = realpath(directory)
+    path = realpath(join(directory, name))
+    if commonpath([directory, path]) != directory:
+        raise ValueError(f"Trace {name} is outside of {directory}")
+    return path
+
+
+class TracePacer(Pacer):
+    """Send the queries of a trace at their recorded times.
+
+    The speed scales the time of the trace, with 10 a trace of ten minutes is
+    replayed in one minute. A looped trace starts over once it is finished.
+    """
+
+    def __init__(self, path: str, speed: float = 1.0, loop: bool = False) -> None:
+        """Open the trace and read its first query."""
+        if speed <= 0:
+            raise ValueError(f"Speed {speed} of a trace replay is not positive")
+        # Lines are decoded one by one, so an undecodable line is skipped.
+        self._file: IO[bytes] = open(path, "rb")
+        self._speed: float = speed
+        self._loop: bool = loop
+        # Trace time replayed so far and at which the current pass started.
+        self._position: float = 0.0
+        self._offset: float = 0.0
+        self._first_timestamp: Optional[float] = None
+        self._last_timestamp: float = 0.0
+        self._next: Optional[Record] = self._read()
+
+    def _read_record(self) -> Optional[Record]:
+        """Return the next query of the file, None at its end."""
+        for line in self._file:
+            try:
+                data = loads(line.decode())
+                timestamp, query = float(data["timestamp"]), str(data["query"])
+            except (ValueError, KeyError, TypeError):
+                # Skip empty and malformed lines.
+                continue
+            if self._first_timestamp is None:
+                self._first_timestamp = self._last_timestamp = timestamp
+            self._last_timestamp = max(self._last_timestamp, timestamp)
+            return self._offset + timestamp - self._first_timestamp, query
+        return None
+
+    def _read(self) -> Optional[Record]:
+        record = self._read_record()
+        if record is None and self._loop and self._get_duration() > 0:
+            self._offset += self._get_duration()
+            self._file.seek(0)
+            record = self._read_record()
+        return record
+
+    def _get_duration(self) -> float:
+        if self._first_timestamp is None:
+            return 0.0
+        return self._last_timestamp - self._first_timestamp
+
+    def get_due(self, elapsed: float) -> Queries:
+        """Return the queries recorded within the scaled elapsed seconds."""
+        self._position += elapsed * self._speed
+        due: Dict[str, int] = {}
+        while self._next is not None and self._next[0] <= self._position:
+            query = self._next[1]
+            due[query] = due.get(query, 0) + 1
+            self._next = self._read()
+        return list(due.items())
+
+    def close(self) -> None:
+        """Close the trace."""
+        self._file.close()
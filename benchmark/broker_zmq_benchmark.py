@@ -12,6 +12,7 @@ import numpy as np
 from matplotlib.pyplot import figure
 from zmq import REQ, Context
 
+from backend.codec import decode, encode
 from backend.request import Header, Request
 from backend.settings import BROKER_LISTENING, BROKER_PORT
 
@@ -98,8 +99,8 @@ def run_clinet(runs):
     start_benchmark = time_ns()
     for _ in range(runs):
         start_ts = time_ns()
-        socket.send_json(Request(header=Header(message="get metric"), body={}))
-        _ = socket.recv_json()
+        socket.send(encode(Request(header=Header(message="get metric"), body={})))
+        _ = decode(socket.recv())
         end_ts = time_ns()
         latency.append(end_ts - start_ts)
     end_benchmark = time_ns()
@@ -161,7 +162,7 @@ def run_benchmark_worker(path):
         with open(f"{path}/zmq_performance_worker_{quan}.txt", "+w") as file:
             file.write(dumps(results[quan]))
         with open(f"{path}/formatted_zmq_performance_worker_{quan}.txt", "+w") as file:
-            file.write(dumps(claculate_values({64: results[quan]})))
+            file.write(dumps(claculate_values((CLIENTS, results[quan]))))
         run(["fuser", "-k", f"{BROKER_PORT}/tcp"])
         sleep(WSGI_INIT_TIME)
     return results
@@ -181,7 +182,7 @@ def run_benchmark_threads(path):
         with open(f"{path}/zmq_performance_threads_{quan}.txt", "+w") as file:
             file.write(dumps(results[quan]))
         with open(f"{path}/formatted_zmq_performance_threads_{quan}.txt", "+w") as file:
-            file.write(dumps(claculate_values({64: results[quan]})))
+            file.write(dumps(claculate_values((CLIENTS, results[quan]))))
         run(["fuser", "-k", f"{BROKER_PORT}/tcp"])
         sleep(WSGI_INIT_TIME)
     return results
@@ -194,9 +195,13 @@ def main():
     print(formatted_results_worker)
     with open("measurements/formatted_worker_zmq_results.txt", "+w") as file:
         file.write(dumps(formatted_results_worker))
-    row_results_threads = run_benchmark_threads()
+    row_results_threads = run_benchmark_threads(path)
     formatted_results_threads = run_calculations(row_results_threads)
     print(formatted_results_threads)
     with open("measurements/formatted_threads_zmq_results.txt", "+w") as file:
         file.write(dumps(formatted_results_threads))
     plot_hdr_histogram(formatted_results_threads, "threads_zmq_hdr")
+
+
+if __name__ == "__main__":
+    main()
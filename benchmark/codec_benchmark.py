@@ -0,0 +1,68 @@
+"""Compare the IPC codecs on published workload messages."""
+from calendar import timegm
+from datetime import datetime
+from json import dumps
+from os import mkdir
+from statistics import mean
+from time import gmtime, perf_counter_ns
+
+from backend.codec import CODEC_NAMES, get_codec
+from backend.response import get_response
+
+FREQUENCIES = [100, 1_000, 10_000, 100_000]
+RUNS = 100
+
+
+def create_folder(name):
+    """Create folder to save benchmark results."""
+    ts = timegm(gmtime())
+    path = f"measurements/{name}_{datetime.utcfromtimestamp(ts).strftime('%Y-%m-%d_%H:%M:%S')}"
+    mkdir(path)
+    return path
+
+
+def create_message(frequency):
+    """Create a workload message listing every query on its own."""
+    response = get_response(200)
+    response["body"]["querylist"] = ["fake_workload" for _ in range(frequency)]
+    return response
+
+
+def measure_codec(codec, message):
+    encode_times = []
+    decode_times = []
+    for _ in range(RUNS):
+        start_ts = perf_counter_ns()
+        data = codec.encode(message)
+        encoded_ts = perf_counter_ns()
+        codec.decode(data)
+        end_ts = perf_counter_ns()
+        encode_times.append(encoded_ts - start_ts)
+        decode_times.append(end_ts - encoded_ts)
+    return {
+        "encode_ms": round(mean(encode_times) / 1_000_000, 4),
+        "decode_ms": round(mean(decode_times) / 1_000_000, 4),
+        "size_bytes": len(data),
+    }
+
+
+def run_benchmark():
+    results = {}
+    for name in CODEC_NAMES:
+        codec = get_codec(name)
+        results[name] = {}
+        for frequency in FREQUENCIES:
+            results[name][frequency] = measure_codec(codec, create_message(frequency))
+            print(f"{name} with {frequency} queries: {results[name][frequency]}")
+    return results
+
+
+def main():
+    path = create_folder("codec_benchmark")
+    results = run_benchmark()
+    with open(f"{path}/codec_results.txt", "+w") as file:
+        file.write(dumps(results))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""Measure CPU usage and shutdown time of idle worker pools."""
+from calendar import timegm
+from datetime import datetime
+from json import dumps
+from multiprocessing import active_children
+from os import mkdir, sysconf
+from time import gmtime, perf_counter, sleep
+
+from backend.database_manager.worker_pool.pool import WorkerPool
+
+NUMBER_DATABASES = [1, 10, 40]
+NUMBER_WORKERS = 8
+WARM_UP_DURATION = 2
+MEASUREMENT_DURATION = 10
+CLOCK_TICKS = sysconf("SC_CLK_TCK")
+
+
+def create_folder(name):
+    """Create folder to save benchmark results."""
+    ts = timegm(gmtime())
+    path = f"measurements/{name}_{datetime.utcfromtimestamp(ts).strftime('%Y-%m-%d_%H:%M:%S')}"
+    mkdir(path)
+    return path
+
+
+def cpu_seconds(pid):
+    """Return user and system CPU time of a process in seconds."""
+    with open(f"/proc/{pid}/stat") as file:
+        fields = file.read().rsplit(")", 1)[1].split()
+    return (int(fields[11]) + int(fields[12])) / CLOCK_TICKS
+
+
+def children_cpu_seconds():
+    return sum(cpu_seconds(process.pid) for process in active_children())
+
+
+def measure_pools(number_databases):
+    pools = [
+        WorkerPool(NUMBER_WORKERS, f"database_{i}") for i in range(number_databases)
+    ]
+    for pool in pools:
+        pool.start()
+    sleep(WARM_UP_DURATION)
+    start_cpu = children_cpu_seconds()
+    sleep(MEASUREMENT_DURATION)
+    end_cpu = children_cpu_seconds()
+    start_ts = perf_counter()
+    for pool in pools:
+        pool.close()
+    end_ts = perf_counter()
+    return {
+        "processes": number_databases * NUMBER_WORKERS,
+        "cpu_percent": round((end_cpu - start_cpu) / MEASUREMENT_DURATION * 100, 2),
+        "close_ms": round((end_ts - start_ts) * 1000, 2),
+    }
+
+
+def run_benchmark():
+    results = {}
+    for number_databases in NUMBER_DATABASES:
+        results[number_databases] = measure_pools(number_databases)
+        print(f"{number_databases} databases: {results[number_databases]}")
+    return results
+
+
+def main():
+    path = create_folder("idle_worker_benchmark")
+    results = run_benchmark()
+    with open(f"{path}/idle_worker_results.txt", "+w") as file:
+        file.write(dumps(results))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""Compare the throughput of metric endpoints with and without the metric cache."""
+import signal
+from json import dumps
+from os import environ
+from subprocess import check_output
+
+from requests import get
+
+from benchmark_tools.settings import BACKEND_HOST, BACKEND_PORT
+
+from .wrk_benchmark_helper import (
+    create_folder,
+    format_results,
+    plot_charts,
+    print_results,
+    start_manager,
+    start_workload_generator,
+    start_wsgi_server,
+    stop_wsgi_server,
+)
+
+NUMBER_CLIENTS = [1, 8, 32, 64]
+BACKEND_URL = f"http://{BACKEND_HOST}:{BACKEND_PORT}"
+DURATION_IN_MINUTES = 5
+ENDPOINTS = ["manager_metric", "manager_time_intense_metric"]
+# Milliseconds responses are cached and served while refreshing.
+CACHE_TTL = 1000
+CACHE_STALE = 1000
+
+
+def execute_wrk_on_endpoint(url, number_clients):
+    """Execute wrk on an endpoint."""
+    return check_output(
+        f"numactl -m 0 --physcpubind 20-79 wrk -t{number_clients} -c{number_clients} -s ./benchmark_tools/report.lua -d{DURATION_IN_MINUTES}m --timeout 20s {url}",
+        shell=True,
+    ).decode("utf-8")
+
+
+def run_wrk_with_cache(cache_ttl, suffix, results, path):
+    """Run wrk on all endpoints against a back-end with a cache TTL."""
+    environ["METRIC_CACHE_TTL"] = str(cache_ttl)
+    environ["METRIC_CACHE_STALE"] = str(CACHE_STALE if cache_ttl else 0)
+    start_wsgi_server(8, 1)
+    for number_client in NUMBER_CLIENTS:
+        results.setdefault(number_client, {})
+        for endpoint in ENDPOINTS:
+            print(f"Run on {endpoint}{suffix} with {number_client} clients")
+            output = execute_wrk_on_endpoint(f"{BACKEND_URL}/{endpoint}", number_client)
+            results[number_client][f"{endpoint}{suffix}"] = output
+            with open(
+                f"{path}/{number_client}_{endpoint}{suffix}_results.txt", "w+"
+            ) as file:
+                file.write(output)
+    statistics = get(f"{BACKEND_URL}/metric_cache").json()
+    stop_wsgi_server()
+    return statistics
+
+
+def run_benchmark():
+    """Run wrk on the metric endpoints without and with the cache."""
+    path = create_folder("metric_cache_wrk_benchmark")
+    manager = start_manager()
+    generator = start_workload_generator()
+    results = {}
+    run_wrk_with_cache(0, "", results, path)
+    statistics = run_wrk_with_cache(CACHE_TTL, "_cached", results, path)
+    print_results(results, None, NUMBER_CLIENTS)
+    print(f"Cache statistics: {statistics}")
+    formatted_results = format_results(results)
+    with open(f"{path}/formatted_results.txt", "+w") as file:
+        file.write(dumps(formatted_results))
+    with open(f"{path}/cache_statistics.txt", "+w") as file:
+        file.write(dumps(statistics))
+    for endpoint in ENDPOINTS:
+        plot_charts(
+            formatted_results,
+            path,
+            (endpoint, f"{endpoint}_cached"),
+            endpoint,
+            "client",
+        )
+    manager.send_signal(signal.SIGINT)
+    manager.wait()
+    generator.send_signal(signal.SIGINT)
+    generator.wait()
+
+
+if __name__ == "__main__":
+    run_benchmark()  # type: ignore
@@ -0,0 +1,113 @@
+"""Count the dashboard clients the live metric stream serves at its cadence.
+
+Opens a growing number of concurrent clients on the metric stream of the ASGI
+app. A client is served if it received nearly every event of the measurement.
+The benchmark stops at the first number of clients that is not fully served.
+"""
+import signal
+from asyncio import TimeoutError, gather, open_connection, run, wait_for
+from json import dumps
+from os import environ
+from subprocess import Popen
+from time import monotonic, sleep
+
+from benchmark_tools.settings import BACKEND_HOST, BACKEND_PORT
+
+from .wrk_benchmark_helper import (
+    WSGI_INIT_TIME,
+    create_folder,
+    start_manager,
+    start_workload_generator,
+)
+
+NUMBER_CLIENTS = [10, 50, 100, 250, 500, 1000, 2000, 4000]
+STREAM_INTERVAL = 1000
+MEASUREMENT_DURATION = 30
+# Share of the expected events a served client received at least.
+SERVED_SHARE = 0.9
+
+
+def start_asgi_server():
+    """Start the ASGI app with the stream interval of the benchmark."""
+    environ["METRIC_STREAM_INTERVAL"] = str(STREAM_INTERVAL)
+    sub_process = Popen(
+        [
+            "pipenv",
+            "run",
+            "uvicorn",
+            "--host",
+            BACKEND_HOST,
+            "--port",
+            BACKEND_PORT,
+            "backend.app.asgi:app",
+        ]
+    )
+    sleep(WSGI_INIT_TIME)
+    return sub_process
+
+
+async def count_events(duration):
+    """Read the stream for a duration and return the number of metric events."""
+    events = 0
+    try:
+        reader, writer = await open_connection(BACKEND_HOST, int(BACKEND_PORT))
+    except OSError:
+        return events
+    writer.write(
+        f"GET /metric_stream HTTP/1.1\r\nHost: {BACKEND_HOST}\r\n\r\n".encode()
+    )
+    deadline = monotonic() + duration
+    try:
+        while True:
+            line = await wait_for(reader.readline(), deadline - monotonic())
+            if not line:
+                break
+            events += line.startswith(b"event: metrics")
+    except (TimeoutError, OSError):
+        pass
+    writer.close()
+    return events
+
+
+async def measure_clients(number_clients):
+    """Connect the clients at once and return how many of them were served."""
+    events = await gather(
+        *[count_events(MEASUREMENT_DURATION) for _ in range(number_clients)]
+    )
+    expected_events = MEASUREMENT_DURATION * 1000 / STREAM_INTERVAL
+    return {
+        "clients": number_clients,
+        "served": sum(count >= SERVED_SHARE * expected_events for count in events),
+        "min_events": min(events),
+        "avg_events": round(sum(events) / number_clients, 2),
+        "expected_events": expected_events,
+    }
+
+
+def run_benchmark():
+    results = {}
+    for number_clients in NUMBER_CLIENTS:
+        results[number_clients] = run(measure_clients(number_clients))
+        print(f"{number_clients} clients: {results[number_clients]}")
+        if results[number_clients]["served"] < number_clients:
+            break
+    supported = max([result["served"] for result in results.values()], default=0)
+    print(f"Supported dashboard clients: {supported}")
+    return results
+
+
+def main():
+    path = create_folder("metric_stream_benchmark")
+    manager = start_manager()
+    generator = start_workload_generator()
+    server = start_asgi_server()
+    results = run_benchmark()
+    with open(f"{path}/metric_stream_results.txt", "+w") as file:
+        file.write(dumps(results))
+    for process in (server, manager, generator):
+        process.send_signal(signal.SIGINT)
+        process.wait()
+
+
+if __name__ == "__main__":
+    main()
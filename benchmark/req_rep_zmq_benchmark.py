@@ -12,6 +12,7 @@ import matplotlib.pyplot as plt
 import numpy as np
 from matplotlib.pyplot import figure
 
+from backend.codec import decode, encode
 from backend.request import Header, Request
 from backend.settings import DB_MANAGER_HOST, DB_MANAGER_PORT
 from zmq import REQ, Context
@@ -94,8 +95,8 @@ def run_clinet(runs):
     start_benchmark = time_ns()
     for _ in range(runs):
         start_ts = time_ns()
-        socket.send_json(Request(header=Header(message="get metric"), body={}))
-        _ = socket.recv_json()
+        socket.send(encode(Request(header=Header(message="get metric"), body={})))
+        _ = decode(socket.recv())
         end_ts = time_ns()
         latency.append(end_ts - start_ts)
     end_benchmark = time_ns()